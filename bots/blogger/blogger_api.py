@@ -6,26 +6,87 @@ Handles authentication and posting to Google Blogger.
 
 import os
 import json
+import atexit
+import importlib.util
+import threading
 from datetime import datetime
 from pathlib import Path
 
-# Google API imports
+# Google API imports are deferred to _load_google() so CLI commands that never
+# talk to Blogger don't pay for them; only check that they are installed here
 try:
-    from google.oauth2.credentials import Credentials
-    from google_auth_oauthlib.flow import InstalledAppFlow
-    from google.auth.transport.requests import Request
-    from googleapiclient.discovery import build
-    GOOGLE_API_AVAILABLE = True
+    GOOGLE_API_AVAILABLE = all(
+        importlib.util.find_spec(name) is not None
+        for name in ("google.auth", "google_auth_oauthlib", "googleapiclient")
+    )
 except ImportError:
     GOOGLE_API_AVAILABLE = False
+if not GOOGLE_API_AVAILABLE:
     print("Warning: Google API libraries not installed. Run: pip install google-api-python-client google-auth-oauthlib")
 
-from config import BLOG_CONFIG, GOOGLE_CONFIG, PATHS
+Credentials = InstalledAppFlow = Request = build = None
+
+
+def _load_google():
+    """Import the Google API modules on first use"""
+    global Credentials, InstalledAppFlow, Request, build
+    if build is None:
+        from google.oauth2.credentials import Credentials
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        from google.auth.transport.requests import Request
+        from googleapiclient.discovery import build
+
+from config import BLOG_CONFIG, GOOGLE_CONFIG, PATHS, ensure_dir
+import jsonio
+
+
+class PostLog:
+    """Append-only JSONL log of published posts with a buffered writer"""
+
+    def __init__(self, path, flush_interval=5.0, buffer_size=64 * 1024):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self._file = None
+        self._timer = None
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def write(self, record):
+        """Buffer one record; it reaches disk on the next flush"""
+        line = jsonio.dumps(record) + b'\n'
+        with self._lock:
+            if self._file is None:
+                ensure_dir(self.path.parent)
+                self._file = open(self.path, 'ab', buffering=self.buffer_size)
+            self._file.write(line)
+            if self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Flush buffered records to disk"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._file is not None:
+                self._file.flush()
+
+
+post_log = PostLog(PATHS["posted_dir"] / "posted.jsonl")
+
+# Parsed credentials keyed by resolved token path: (creds, token JSON last on disk)
+_creds_cache = {}
 
 
 class BloggerClient:
     """Client for interacting with Blogger API"""
 
+    # Authenticated (credentials, service) pairs shared across instances, keyed by blog_id
+    _service_cache = {}
+
     def __init__(self):
         self.service = None
         self.blog_id = BLOG_CONFIG["blog_id"]
@@ -35,17 +96,32 @@ class BloggerClient:
         """Authenticate with Google Blogger API"""
         if not GOOGLE_API_AVAILABLE:
             raise RuntimeError("Google API libraries not installed")
+        _load_google()
+
+        # Reuse the service built earlier in this process while its token is good
+        cached = BloggerClient._service_cache.get(self.blog_id)
+        if cached:
+            creds, service = cached
+            if creds.expired and creds.refresh_token:
+                creds.refresh(Request())
+                self._save_token(creds)
+            if creds.valid:
+                self.credentials, self.service = creds, service
+                return True
 
-        creds = None
         token_path = Path(GOOGLE_CONFIG["token_path"])
         creds_path = Path(GOOGLE_CONFIG["credentials_path"])
-
-        # Load existing token
-        if token_path.exists():
-            creds = Credentials.from_authorized_user_file(
-                str(token_path),
+        cache_key = str(token_path.resolve())
+        creds, _ = _creds_cache.get(cache_key, (None, None))
+
+        # Load existing token (once per process)
+        if creds is None and token_path.exists():
+            saved_token = token_path.read_text()
+            creds = Credentials.from_authorized_user_info(
+                json.loads(saved_token),
                 GOOGLE_CONFIG["scopes"]
             )
+            _creds_cache[cache_key] = (creds, saved_token)
 
         # Refresh or get new credentials
         if not creds or not creds.valid:
@@ -64,14 +140,29 @@ class BloggerClient:
                 creds = flow.run_local_server(port=0)
 
             # Save token for future use
-            with open(token_path, 'w') as token:
-                token.write(creds.to_json())
+            self._save_token(creds)
 
         self.credentials = creds
-        self.service = build('blogger', 'v3', credentials=creds)
+        # Use the discovery document bundled with googleapiclient (no HTTP fetch)
+        self.service = build(
+            'blogger', 'v3', credentials=creds,
+            static_discovery=True, cache_discovery=False
+        )
+        BloggerClient._service_cache[self.blog_id] = (creds, self.service)
         print("Authenticated with Blogger API")
         return True
 
+    def _save_token(self, creds):
+        """Write the token file, skipping the write if it hasn't changed"""
+        token_path = Path(GOOGLE_CONFIG["token_path"])
+        cache_key = str(token_path.resolve())
+        token_json = creds.to_json()
+        _, saved_token = _creds_cache.get(cache_key, (None, None))
+        if token_json != saved_token:
+            with open(token_path, 'w') as token:
+                token.write(token_json)
+        _creds_cache[cache_key] = (creds, token_json)
+
     def get_blog_info(self):
         """Get information about the blog"""
         if not self.service:
@@ -116,22 +207,24 @@ class BloggerClient:
             "labels": labels
         }
 
+        draft = is_draft or BLOG_CONFIG["draft_mode"]
+
         try:
-            if is_draft or BLOG_CONFIG["draft_mode"]:
-                # Create as draft
-                post = self.service.posts().insert(
-                    blogId=self.blog_id,
-                    body=post_body,
-                    isDraft=True
-                ).execute()
+            try:
+                post = self._insert_post(post_body, draft)
+            except Exception as e:
+                if getattr(getattr(e, "resp", None), "status", None) != 401:
+                    raise
+                if not getattr(self.credentials, "refresh_token", None):
+                    raise
+                # Token was revoked or expired server-side: refresh it and retry once
+                self._invalidate()
+                self.authenticate()
+                post = self._insert_post(post_body, draft)
+
+            if draft:
                 print(f"Draft created: {post.get('title')}")
             else:
-                # Publish immediately
-                post = self.service.posts().insert(
-                    blogId=self.blog_id,
-                    body=post_body,
-                    isDraft=False
-                ).execute()
                 print(f"Published: {post.get('title')}")
 
             # Log the post
@@ -142,6 +235,25 @@ class BloggerClient:
             print(f"Error creating post: {e}")
             return None
 
+    def _insert_post(self, post_body, is_draft):
+        """Insert a post as a draft or published"""
+        return self.service.posts().insert(
+            blogId=self.blog_id,
+            body=post_body,
+            isDraft=is_draft
+        ).execute()
+
+    def _invalidate(self):
+        """
+        Drop the cached service and refresh the rejected access token, so the
+        next authenticate() rebuilds the service with a new one (the cached
+        credentials would otherwise still look valid until their expiry)
+        """
+        BloggerClient._service_cache.pop(self.blog_id, None)
+        self.service = None
+        self.credentials.refresh(Request())
+        self._save_token(self.credentials)
+
     def get_recent_posts(self, max_results=10):
         """Get recent posts from the blog"""
         if not self.service:
@@ -159,15 +271,14 @@ class BloggerClient:
 
     def _log_post(self, post):
         """Log posted content for records"""
-        log_file = PATHS["posted_dir"] / f"{datetime.now().strftime('%Y-%m-%d_%H-%M')}.json"
-        with open(log_file, 'w') as f:
-            json.dump({
-                "id": post.get("id"),
-                "title": post.get("title"),
-                "url": post.get("url"),
-                "published": post.get("published"),
-                "labels": post.get("labels", [])
-            }, f, indent=2)
+        post_log.write({
+            "logged_at": datetime.now().isoformat(),
+            "id": post.get("id"),
+            "title": post.get("title"),
+            "url": post.get("url"),
+            "published": post.get("published"),
+            "labels": post.get("labels", [])
+        })
 
 
 class MockBloggerClient:
@@ -189,11 +300,12 @@ class MockBloggerClient:
         }
 
     def create_post(self, title, content, labels=None, is_draft=False):
-        post_id = f"mock_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        now = datetime.now()
+        post_id = f"mock_{now.strftime('%Y%m%d%H%M%S')}"
         print(f"[MOCK] {'Draft' if is_draft else 'Published'}: {title}")
 
         # Save to drafts folder for review
-        draft_file = PATHS["drafts_dir"] / f"{post_id}.html"
+        draft_file = ensure_dir(PATHS["drafts_dir"]) / f"{post_id}.html"
         with open(draft_file, 'w') as f:
             f.write(f"<h1>{title}</h1>\n{content}")
         print(f"[MOCK] Saved to: {draft_file}")
@@ -202,7 +314,7 @@ class MockBloggerClient:
             "id": post_id,
             "title": title,
             "url": f"{BLOG_CONFIG['blog_url']}/mock/{post_id}",
-            "published": datetime.now().isoformat(),
+            "published": now.isoformat(),
             "labels": labels or BLOG_CONFIG["default_labels"]
         }
 
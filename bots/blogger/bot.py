@@ -19,6 +19,7 @@ Usage:
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add parent path for imports
@@ -70,46 +71,70 @@ def show_status(scheduler):
     print(f"  Scheduler logs:  {PATHS['logs_dir']}")
 
 
-def setup_wizard():
-    """Interactive setup wizard"""
-    print("\n🔧 SETUP WIZARD")
-    print("=" * 50)
-
-    # Check Google API
-    print("\n1. Checking Google API libraries...")
+def check_google_api():
+    """Setup check: Google API libraries"""
     if GOOGLE_API_AVAILABLE:
-        print("   ✓ Google API libraries installed")
-    else:
-        print("   ✗ Missing libraries. Run:")
-        print("     pip install google-api-python-client google-auth-oauthlib")
+        return ["   ✓ Google API libraries installed"]
+    return [
+        "   ✗ Missing libraries. Run:",
+        "     pip install google-api-python-client google-auth-oauthlib",
+    ]
 
-    # Check credentials
-    print("\n2. Checking credentials...")
+
+def check_credentials():
+    """Setup check: OAuth credentials file"""
     creds_path = Path(BLOG_CONFIG.get("credentials_path", "credentials.json"))
     if creds_path.exists():
-        print(f"   ✓ Found: {creds_path}")
-    else:
-        print(f"   ✗ Missing: {creds_path}")
-        print("   Download from: Google Cloud Console > APIs & Services > Credentials")
-        print("   Enable the Blogger API first!")
+        return [f"   ✓ Found: {creds_path}"]
+    return [
+        f"   ✗ Missing: {creds_path}",
+        "   Download from: Google Cloud Console > APIs & Services > Credentials",
+        "   Enable the Blogger API first!",
+    ]
+
 
-    # Check Blog ID
-    print("\n3. Checking Blog ID...")
+def check_blog_id():
+    """Setup check: Blog ID configured"""
     if BLOG_CONFIG["blog_id"] != "YOUR_BLOG_ID_HERE":
-        print(f"   ✓ Blog ID: {BLOG_CONFIG['blog_id']}")
-    else:
-        print("   ✗ Blog ID not set!")
-        print("   Get it from: Blogger Dashboard > Settings > Blog ID")
-        print("   Or from the URL: blogger.com/blog/posts/BLOG_ID")
-
-    # Check Ollama
-    print("\n4. Checking Ollama (optional)...")
-    generator = ContentGenerator()
-    if generator.check_ollama():
-        print(f"   ✓ Ollama available at {AI_CONFIG['ollama_url']}")
-    else:
-        print(f"   ○ Ollama not available (will use templates)")
-        print(f"     To enable AI: Install Ollama and run 'ollama pull {AI_CONFIG['model']}'")
+        return [f"   ✓ Blog ID: {BLOG_CONFIG['blog_id']}"]
+    return [
+        "   ✗ Blog ID not set!",
+        "   Get it from: Blogger Dashboard > Settings > Blog ID",
+        "   Or from the URL: blogger.com/blog/posts/BLOG_ID",
+    ]
+
+
+def check_ollama():
+    """Setup check: local Ollama server"""
+    if ContentGenerator().check_ollama():
+        return [f"   ✓ Ollama available at {AI_CONFIG['ollama_url']}"]
+    return [
+        "   ○ Ollama not available (will use templates)",
+        f"     To enable AI: Install Ollama and run 'ollama pull {AI_CONFIG['model']}'",
+    ]
+
+
+SETUP_CHECKS = [
+    ("Checking Google API libraries...", check_google_api),
+    ("Checking credentials...", check_credentials),
+    ("Checking Blog ID...", check_blog_id),
+    ("Checking Ollama (optional)...", check_ollama),
+]
+
+
+def setup_wizard():
+    """Interactive setup wizard"""
+    print("\n🔧 SETUP WIZARD")
+    print("=" * 50)
+
+    # Run all probes at once so the wizard waits only for the slowest one
+    with ThreadPoolExecutor(max_workers=len(SETUP_CHECKS)) as executor:
+        futures = [executor.submit(check) for _, check in SETUP_CHECKS]
+
+        for number, ((label, _), future) in enumerate(zip(SETUP_CHECKS, futures), 1):
+            print(f"\n{number}. {label}")
+            for line in future.result():
+                print(line)
 
     print("\n" + "=" * 50)
     print("Setup complete! Edit config.py to configure settings.")
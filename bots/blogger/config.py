@@ -64,12 +64,20 @@ PATHS = {
     "logs_dir": Path(__file__).parent / "logs",
     "drafts_dir": Path(__file__).parent / "drafts",
     "posted_dir": Path(__file__).parent / "posted",
-    "queue_file": Path(__file__).parent / "post_queue.json",
+    "queue_file": Path(__file__).parent / "post_queue.jsonl",
 }
 
-# Create directories
-for path in [PATHS["logs_dir"], PATHS["drafts_dir"], PATHS["posted_dir"]]:
-    path.mkdir(exist_ok=True)
+# Directories already created by this process
+_ensured_dirs = set()
+
+
+def ensure_dir(path):
+    """Create a directory on first use (checked once per process)"""
+    if path not in _ensured_dirs:
+        path.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(path)
+    return path
+
 
 # Bot personality (for AI-generated content)
 BOT_PERSONALITY = """
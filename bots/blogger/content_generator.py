@@ -5,8 +5,11 @@ Generates blog post content using local Ollama LLM or template fallback.
 """
 
 import random
-import json
-from datetime import datetime
+import re
+import time
+from collections import deque
+from datetime import date, datetime
+from functools import lru_cache
 from typing import Optional, Dict
 
 try:
@@ -15,7 +18,45 @@ try:
 except ImportError:
     REQUESTS_AVAILABLE = False
 
+# Shared HTTP session so Ollama calls reuse pooled keep-alive connections
+_session = requests.Session() if REQUESTS_AVAILABLE else None
+
 from config import AI_CONFIG, CONTENT_TEMPLATES, BOT_PERSONALITY
+import jsonio
+
+# How long a successful Ollama probe is trusted before probing again
+OLLAMA_CHECK_TTL = 60
+
+# Static parts of the AI prompt, built once; the topic goes between them
+_PROMPT_PREFIX = BOT_PERSONALITY + "\n\nWrite a blog post for Black Crab Park about: "
+_PROMPT_SUFFIX = """
+
+The post should:
+- Have an engaging title (on its own line, starting with "TITLE: ")
+- Be 200-400 words
+- Be warm and community-focused
+- Include a greeting and closing
+- Be formatted in simple HTML with <p> tags
+
+Today's date is {date}.
+
+Write the blog post now:"""
+
+# Blank-line paragraph breaks (with surrounding whitespace) in plain-text AI output
+_PARA_BREAK_RE = re.compile(r'\s*\n\s*\n\s*')
+
+# The queue log is compacted once it holds at least this many entries and
+# more than two per pending post
+QUEUE_COMPACT_MIN_ENTRIES = 64
+
+# Topics in scheduled rotation order
+_TOPIC_ROTATION = tuple(CONTENT_TEMPLATES["topics"])
+
+
+@lru_cache(maxsize=1)
+def _long_date(ordinal: int) -> str:
+    """Format a date ordinal like "January 05, 2026" (cached for the day)"""
+    return date.fromordinal(ordinal).strftime("%B %d, %Y")
 
 
 class ContentGenerator:
@@ -25,17 +66,30 @@ class ContentGenerator:
         self.ollama_url = AI_CONFIG["ollama_url"]
         self.model = AI_CONFIG["model"]
         self.ai_enabled = AI_CONFIG["enabled"]
+        self._ollama_ok_until = 0.0
+
+        # Per-instance PRNG (no shared module-level state) over frozen templates
+        self._rng = random.Random()
+        self._greetings = tuple(CONTENT_TEMPLATES["greeting"])
+        self._closings = tuple(CONTENT_TEMPLATES["closing"])
 
     def check_ollama(self) -> bool:
         """Check if Ollama is available"""
         if not REQUESTS_AVAILABLE or not self.ai_enabled:
             return False
 
+        if time.monotonic() < self._ollama_ok_until:
+            return True
+
         try:
-            response = requests.get(f"{self.ollama_url}/api/tags", timeout=5)
-            return response.status_code == 200
+            response = _session.get(f"{self.ollama_url}/api/tags", timeout=5)
+            available = response.status_code == 200
         except Exception:
-            return False
+            available = False
+
+        if available:
+            self._ollama_ok_until = time.monotonic() + OLLAMA_CHECK_TTL
+        return available
 
     def generate_with_ollama(self, prompt: str) -> Optional[str]:
         """Generate content using local Ollama"""
@@ -43,45 +97,58 @@ class ContentGenerator:
             return None
 
         try:
-            response = requests.post(
+            # Stream the reply so tokens are consumed as they are decoded
+            with _session.post(
                 f"{self.ollama_url}/api/generate",
                 json={
                     "model": self.model,
                     "prompt": prompt,
-                    "stream": False,
+                    "stream": True,
                     "options": {
                         "temperature": 0.7,
                         "top_p": 0.9,
                         "num_predict": 800
                     }
                 },
-                timeout=120
-            )
-
-            if response.status_code == 200:
-                return response.json().get("response", "").strip()
+                timeout=120,
+                stream=True
+            ) as response:
+                if response.status_code == 200:
+                    parts = []
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+                        chunk = jsonio.loads(line)
+                        parts.append(chunk.get("response", ""))
+                        if chunk.get("done"):
+                            break
+                    return "".join(parts).strip()
         except Exception as e:
             print(f"Ollama error: {e}")
 
+        # Probe again before the next generation
+        self._ollama_ok_until = 0.0
         return None
 
     def generate_from_template(self, topic: Optional[str] = None) -> Dict[str, str]:
         """Generate content from templates (fallback)"""
         if topic is None:
-            topic = random.choice(CONTENT_TEMPLATES["topics"])
+            topic = self._rng.choice(_TOPIC_ROTATION)
 
-        greeting = random.choice(CONTENT_TEMPLATES["greeting"])
-        closing = random.choice(CONTENT_TEMPLATES["closing"])
+        greeting = self._rng.choice(self._greetings)
+        closing = self._rng.choice(self._closings)
 
         # Generate a simple post
-        date_str = datetime.now().strftime("%B %d, %Y")
+        now = datetime.now()
+        month = now.strftime("%B")
+        date_str = now.strftime("%B %d, %Y")
 
         content = f"""
 <p>{greeting}</p>
 
 <p>Today we're sharing some thoughts about <strong>{topic}</strong> here at Black Crab Park.</p>
 
-<p>As we move through {datetime.now().strftime("%B")}, there's always something happening in our little corner of the world. Whether it's the changing seasons, community gatherings, or just the everyday moments that make our neighborhood special, we're here to keep you connected.</p>
+<p>As we move through {month}, there's always something happening in our little corner of the world. Whether it's the changing seasons, community gatherings, or just the everyday moments that make our neighborhood special, we're here to keep you connected.</p>
 
 <p>We encourage everyone to get out and enjoy what our community has to offer. Take a walk through the park, say hello to your neighbors, and remember that we're all in this together.</p>
 
@@ -116,22 +183,11 @@ class ContentGenerator:
                 prompt = custom_prompt
             else:
                 if topic is None:
-                    topic = random.choice(CONTENT_TEMPLATES["topics"])
+                    topic = self._rng.choice(_TOPIC_ROTATION)
 
-                prompt = f"""{BOT_PERSONALITY}
-
-Write a blog post for Black Crab Park about: {topic}
-
-The post should:
-- Have an engaging title (on its own line, starting with "TITLE: ")
-- Be 200-400 words
-- Be warm and community-focused
-- Include a greeting and closing
-- Be formatted in simple HTML with <p> tags
-
-Today's date is {datetime.now().strftime("%B %d, %Y")}.
-
-Write the blog post now:"""
+                prompt = _PROMPT_PREFIX + topic + _PROMPT_SUFFIX.format(
+                    date=_long_date(date.today().toordinal())
+                )
 
             ai_content = self.generate_with_ollama(prompt)
 
@@ -140,16 +196,18 @@ Write the blog post now:"""
                 lines = ai_content.split('\n')
                 title = f"Black Crab Park: {topic.title() if topic else 'Community Update'}"
 
-                for line in lines:
-                    if line.strip().upper().startswith("TITLE:"):
-                        title = line.split(":", 1)[1].strip()
-                        ai_content = '\n'.join(lines[lines.index(line)+1:])
+                for i, line in enumerate(lines):
+                    stripped = line.lstrip()
+                    if stripped[:6].upper() == "TITLE:":
+                        title = stripped[6:].strip()
+                        ai_content = '\n'.join(lines[i + 1:])
                         break
 
                 # Ensure HTML formatting
                 if '<p>' not in ai_content:
-                    paragraphs = ai_content.split('\n\n')
-                    ai_content = '\n'.join(f"<p>{p.strip()}</p>" for p in paragraphs if p.strip())
+                    ai_content = ai_content.strip()
+                    if ai_content:
+                        ai_content = '<p>' + _PARA_BREAK_RE.sub('</p>\n<p>', ai_content) + '</p>'
 
                 return {
                     "title": title,
@@ -172,62 +230,162 @@ Write the blog post now:"""
     def generate_scheduled_post(self) -> Dict[str, str]:
         """Generate a post for scheduled publishing"""
         # Rotate through topics
-        topics = CONTENT_TEMPLATES["topics"]
-        day_of_year = datetime.now().timetuple().tm_yday
-        topic_index = (day_of_year // 3) % len(topics)  # Rotate every 3 days
-        topic = topics[topic_index]
+        day_of_year = date.today().timetuple().tm_yday
+        topic_index = (day_of_year // 3) % len(_TOPIC_ROTATION)  # Rotate every 3 days
+        topic = _TOPIC_ROTATION[topic_index]
 
         return self.generate_post(topic=topic)
 
 
 class PostQueue:
-    """Manage a queue of posts to be published"""
+    """
+    Manage a queue of posts to be published
+
+    The queue is persisted as an append-only JSONL log of operations
+    ("add" / "mark_posted") that is replayed on load, so each mutation
+    writes one line instead of rewriting the whole file. A queue saved by
+    older versions as a JSON list (post_queue.json) is imported on first load.
+    """
 
     def __init__(self, queue_file):
         self.queue_file = queue_file
+        self._log_entries = 0
+        self._needs_compact = False  # Set by _load_queue for corrupt or imported entries
+        self._imported_legacy = False
         self.queue = self._load_queue()
 
+        # Indexes so lookups don't scan the whole queue
+        self._by_queued_at = {p.get('queued_at'): p for p in self.queue}
+        self._pending = deque(p for p in self.queue if p.get('status') == 'queued')
+
+        if self._needs_compact or self._should_compact():
+            self.compact()
+
+        if self._imported_legacy:
+            # Keep the old file, but out of the way of later imports
+            legacy_file = self.queue_file.with_suffix('.json')
+            legacy_file.replace(legacy_file.with_suffix('.json.migrated'))
+
     def _load_queue(self) -> list:
-        """Load queue from file"""
-        if self.queue_file.exists():
-            try:
-                with open(self.queue_file, 'r') as f:
-                    return json.load(f)
-            except Exception:
-                pass
-        return []
-
-    def _save_queue(self):
-        """Save queue to file"""
-        with open(self.queue_file, 'w') as f:
-            json.dump(self.queue, f, indent=2)
+        """Load queue by replaying the operation log"""
+        if not self.queue_file.exists():
+            return self._import_legacy_queue()
+
+        queue = []
+        by_queued_at = {}
+        try:
+            with open(self.queue_file, 'rb') as f:
+                for line_no, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    self._log_entries += 1
+
+                    # A torn or corrupt line (e.g. from a crash mid-append) is
+                    # skipped on its own; the entries after it still replay
+                    try:
+                        entry = jsonio.loads(line)
+                        op = entry.get("op")
+                        if op == "add":
+                            post = entry["post"]
+                            queue.append(post)
+                            by_queued_at[post.get("queued_at")] = post
+                        elif op == "mark_posted":
+                            post = by_queued_at.get(entry.get("queued_at"))
+                            if post is not None:
+                                post['status'] = 'posted'
+                                post['posted_at'] = entry.get("posted_at")
+                    except (ValueError, KeyError, TypeError, AttributeError) as e:
+                        print(f"Skipping corrupt queue entry at {self.queue_file}:{line_no}: {e}")
+                        self._needs_compact = True
+        except OSError as e:
+            print(f"Could not read post queue {self.queue_file}: {e}")
+        return queue
+
+    def _import_legacy_queue(self) -> list:
+        """Load a queue saved as a JSON list by older versions, if there is one"""
+        legacy_file = self.queue_file.with_suffix('.json')
+        if not legacy_file.exists():
+            return []
+
+        try:
+            queue = jsonio.loads(legacy_file.read_bytes())
+        except (OSError, ValueError) as e:
+            print(f"Could not import old post queue {legacy_file}: {e}")
+            return []
+        if not isinstance(queue, list):
+            return []
+
+        self._imported_legacy = True
+        self._needs_compact = True
+        return queue
+
+    def _append(self, entry: Dict):
+        """Append one operation to the log"""
+        with open(self.queue_file, 'ab') as f:
+            f.write(jsonio.dumps(entry) + b'\n')
+        self._log_entries += 1
+
+    def _should_compact(self) -> bool:
+        """True once the log is mostly entries for posts already published"""
+        return (
+            self._log_entries >= QUEUE_COMPACT_MIN_ENTRIES
+            and self._log_entries > 2 * len(self._pending)
+        )
+
+    def compact(self):
+        """
+        Rewrite the log as one "add" entry per pending post. Published posts
+        are dropped from the queue (the Blogger client logs them to
+        posted/posted.jsonl), so the log stays proportional to the backlog.
+        """
+        self.queue = list(self._pending)
+        self._by_queued_at = {p.get('queued_at'): p for p in self.queue}
+
+        tmp_file = self.queue_file.with_suffix('.tmp')
+        with open(tmp_file, 'wb') as f:
+            for post in self.queue:
+                f.write(jsonio.dumps({"op": "add", "post": post}) + b'\n')
+        tmp_file.replace(self.queue_file)
+        self._log_entries = len(self.queue)
 
     def add(self, post: Dict):
         """Add post to queue"""
         post['queued_at'] = datetime.now().isoformat()
         post['status'] = 'queued'
         self.queue.append(post)
-        self._save_queue()
+        self._by_queued_at[post['queued_at']] = post
+        self._pending.append(post)
+        self._append({"op": "add", "post": post})
 
     def get_next(self) -> Optional[Dict]:
         """Get next post from queue"""
-        for post in self.queue:
-            if post.get('status') == 'queued':
-                return post
-        return None
+        return self._pending[0] if self._pending else None
 
     def mark_posted(self, post: Dict):
         """Mark post as published"""
-        for p in self.queue:
-            if p.get('queued_at') == post.get('queued_at'):
-                p['status'] = 'posted'
-                p['posted_at'] = datetime.now().isoformat()
-                break
-        self._save_queue()
+        p = self._by_queued_at.get(post.get('queued_at'))
+        if p is None or p.get('status') != 'queued':
+            return
+
+        p['status'] = 'posted'
+        p['posted_at'] = datetime.now().isoformat()
+        # Posts are normally published in queue order, so this is a popleft
+        if self._pending[0] is p:
+            self._pending.popleft()
+        else:
+            self._pending.remove(p)
+        self._append({
+            "op": "mark_posted",
+            "queued_at": p['queued_at'],
+            "posted_at": p['posted_at']
+        })
+
+        if self._should_compact():
+            self.compact()
 
     def get_pending_count(self) -> int:
-        """Get count of queued posts"""
-        return len([p for p in self.queue if p.get('status') == 'queued'])
+        """Get count of queued posts (kept up to date by add/mark_posted, no scan)"""
+        return len(self._pending)
 
 
 if __name__ == "__main__":
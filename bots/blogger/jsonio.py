@@ -0,0 +1,27 @@
+"""
+JSON helpers for the Black Crab Park Blog Bot
+
+Uses orjson (C extension) when installed and falls back to the stdlib
+json module. Both functions work on bytes, one compact document per line.
+"""
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
+
+
+if ORJSON_AVAILABLE:
+    def dumps(obj) -> bytes:
+        """Serialize obj to compact JSON bytes"""
+        return orjson.dumps(obj)
+
+    loads = orjson.loads
+else:
+    def dumps(obj) -> bytes:
+        """Serialize obj to compact JSON bytes"""
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+    loads = json.loads
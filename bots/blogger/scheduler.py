@@ -11,22 +11,23 @@ Can run as:
 import os
 import sys
 import json
-import time
 import signal
 import logging
+import threading
 from datetime import datetime, timedelta
+from functools import cached_property
 from pathlib import Path
 
-from config import BLOG_CONFIG, PATHS
-from blogger_api import get_client
-from content_generator import ContentGenerator, PostQueue
+from config import BLOG_CONFIG, PATHS, ensure_dir
+import jsonio
 
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler(PATHS["logs_dir"] / "scheduler.log"),
+        # Opened on first record; BlogScheduler creates logs_dir
+        logging.FileHandler(PATHS["logs_dir"] / "scheduler.log", delay=True),
         logging.StreamHandler()
     ]
 )
@@ -37,45 +38,95 @@ class BlogScheduler:
     """Scheduler for automated blog posting"""
 
     def __init__(self, use_mock=False):
-        self.blogger = get_client(use_mock=use_mock)
-        self.generator = ContentGenerator()
-        self.queue = PostQueue(PATHS["queue_file"])
+        ensure_dir(PATHS["logs_dir"])
+        self.use_mock = use_mock
         self.state_file = PATHS["base_dir"] / "scheduler_state.json"
         self.running = False
+        self._stop = threading.Event()
+        self._state = None
+        self._last_post_cache = (None, None)  # (last_post string, parsed datetime)
+        self._authenticated = False
+
+    # Components are built on first use so --status/--cron skip what they don't need
+
+    @cached_property
+    def blogger(self):
+        """Blogger client (mock or real)"""
+        from blogger_api import get_client
+        return get_client(use_mock=self.use_mock)
+
+    @cached_property
+    def generator(self):
+        """Post content generator"""
+        from content_generator import ContentGenerator
+        return ContentGenerator()
+
+    @cached_property
+    def queue(self):
+        """Queue of posts waiting to be published"""
+        from content_generator import PostQueue
+        return PostQueue(PATHS["queue_file"])
 
     def _load_state(self) -> dict:
-        """Load scheduler state"""
-        if self.state_file.exists():
-            try:
-                with open(self.state_file, 'r') as f:
-                    return json.load(f)
-            except Exception:
-                pass
-        return {"last_post": None, "post_count": 0}
+        """Load scheduler state (read from disk once, then served from memory)"""
+        if self._state is None:
+            self._state = {"last_post": None, "post_count": 0}
+            if self.state_file.exists():
+                try:
+                    with open(self.state_file, 'r') as f:
+                        self._state = json.load(f)
+                except Exception:
+                    pass
+        return self._state
 
     def _save_state(self, state: dict):
-        """Save scheduler state"""
-        with open(self.state_file, 'w') as f:
-            json.dump(state, f, indent=2)
+        """Save scheduler state (atomically, via a temp file and rename)"""
+        self._state = state
+        tmp_file = self.state_file.with_suffix('.json.tmp')
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, jsonio.dumps(state))
+        finally:
+            os.close(fd)
+        os.replace(tmp_file, self.state_file)
+
+    def _last_post_date(self):
+        """Parsed last_post timestamp (None if never posted or unreadable)"""
+        last_post = self._load_state().get("last_post")
+        cached_str, cached_date = self._last_post_cache
+        if last_post == cached_str:
+            return cached_date
+
+        try:
+            last_date = datetime.fromisoformat(last_post) if last_post else None
+        except (TypeError, ValueError):
+            last_date = None
+        self._last_post_cache = (last_post, last_date)
+        return last_date
+
+    def _ensure_authenticated(self):
+        """Authenticate the Blogger client unless its token is good for another minute"""
+        if self._authenticated:
+            expiry = getattr(getattr(self.blogger, "credentials", None), "expiry", None)
+            if expiry is None or expiry > datetime.utcnow() + timedelta(seconds=60):
+                return
+
+        self.blogger.authenticate()
+        self._authenticated = True
 
     def should_post_today(self) -> bool:
         """Check if we should post today based on 3-day interval"""
-        state = self._load_state()
-        last_post = state.get("last_post")
-
-        if last_post is None:
+        last_date = self._last_post_date()
+        if last_date is None:
             return True
 
-        try:
-            last_date = datetime.fromisoformat(last_post)
-            days_since = (datetime.now() - last_date).days
-            return days_since >= BLOG_CONFIG["post_interval_days"]
-        except Exception:
-            return True
+        days_since = (datetime.now() - last_date).days
+        return days_since >= BLOG_CONFIG["post_interval_days"]
 
     def create_and_post(self, topic: str = None, is_draft: bool = False) -> dict:
         """Generate and post content"""
-        logger.info(f"Generating post (topic: {topic or 'auto'})")
+        error = None
+        logger.info("Generating post (topic: %s)", topic or 'auto')
 
         # Generate content
         if topic:
@@ -83,11 +134,11 @@ class BlogScheduler:
         else:
             post_data = self.generator.generate_scheduled_post()
 
-        logger.info(f"Generated: {post_data['title']} (via {post_data['method']})")
+        logger.info("Generated: %s (via %s)", post_data['title'], post_data['method'])
 
         # Authenticate and post
         try:
-            self.blogger.authenticate()
+            self._ensure_authenticated()
             result = self.blogger.create_post(
                 title=post_data["title"],
                 content=post_data["content"],
@@ -101,20 +152,21 @@ class BlogScheduler:
                 state["post_count"] = state.get("post_count", 0) + 1
                 self._save_state(state)
 
-                logger.info(f"Posted successfully: {result.get('url', 'N/A')}")
+                logger.info("Posted successfully: %s", result.get('url', 'N/A'))
                 return {"success": True, "post": result, "content": post_data}
 
         except Exception as e:
-            logger.error(f"Failed to post: {e}")
+            error = e
+            logger.error("Failed to post: %s", e)
 
-        return {"success": False, "error": str(e) if 'e' in dir() else "Unknown error"}
+        return {"success": False, "error": str(error) if error else "Unknown error"}
 
     def check_and_post(self):
         """Check if it's time to post and do so"""
         if not self.should_post_today():
             state = self._load_state()
             last = state.get("last_post", "never")
-            logger.info(f"Not time to post yet. Last post: {last}")
+            logger.info("Not time to post yet. Last post: %s", last)
             return False
 
         logger.info("Time to post! Starting scheduled post...")
@@ -123,48 +175,49 @@ class BlogScheduler:
 
     def run_daemon(self, check_interval_hours: int = 1):
         """Run as a daemon, checking periodically"""
-        logger.info(f"Starting scheduler daemon (check every {check_interval_hours}h)")
+        logger.info("Starting scheduler daemon (check every %sh)", check_interval_hours)
         self.running = True
+        self._stop.clear()
 
         def handle_signal(signum, frame):
             logger.info("Received shutdown signal")
             self.running = False
+            self._stop.set()
 
         signal.signal(signal.SIGTERM, handle_signal)
         signal.signal(signal.SIGINT, handle_signal)
 
         while self.running:
+            # Pick up state written by other processes (e.g. a manual --post-now)
+            self._state = None
             try:
                 self.check_and_post()
             except Exception as e:
-                logger.error(f"Error in daemon loop: {e}")
+                logger.error("Error in daemon loop: %s", e)
 
-            # Sleep until next check
-            for _ in range(check_interval_hours * 60):  # Check every minute for shutdown
-                if not self.running:
-                    break
-                time.sleep(60)
+            # Single timed wait until the next check; a shutdown signal ends it early
+            self._stop.wait(check_interval_hours * 3600)
 
         logger.info("Scheduler daemon stopped")
 
     def get_status(self) -> dict:
         """Get scheduler status"""
         state = self._load_state()
-        last_post = state.get("last_post")
+        last_date = self._last_post_date()
+        now = datetime.now()
 
-        if last_post:
-            last_date = datetime.fromisoformat(last_post)
-            days_since = (datetime.now() - last_date).days
+        if last_date:
+            days_since = (now - last_date).days
             next_post = last_date + timedelta(days=BLOG_CONFIG["post_interval_days"])
         else:
             days_since = None
-            next_post = datetime.now()
+            next_post = now
 
         return {
-            "last_post": last_post,
+            "last_post": state.get("last_post"),
             "days_since_last": days_since,
             "next_post_due": next_post.isoformat() if next_post else None,
-            "should_post_now": self.should_post_today(),
+            "should_post_now": days_since is None or days_since >= BLOG_CONFIG["post_interval_days"],
             "post_count": state.get("post_count", 0),
             "queue_size": self.queue.get_pending_count(),
             "interval_days": BLOG_CONFIG["post_interval_days"],
@@ -172,14 +225,17 @@ class BlogScheduler:
         }
 
 
+# Invariants for the cron/systemd templates, resolved once
+_SCRIPT_PATH = Path(__file__).resolve()
+_PYTHON = sys.executable
+_USER = os.getenv('USER', 'pi')
+
+
 def generate_cron_entry():
     """Generate cron entry for running every 3 days at 9 AM"""
-    script_path = Path(__file__).resolve()
-    python_path = sys.executable
-
     # Run at 9:00 AM on days 1, 4, 7, 10, 13, 16, 19, 22, 25, 28 of each month
     # This approximates "every 3 days"
-    cron_line = f"0 9 */3 * * cd {script_path.parent} && {python_path} {script_path} --once"
+    cron_line = f"0 9 */3 * * cd {_SCRIPT_PATH.parent} && {_PYTHON} {_SCRIPT_PATH} --once"
 
     return f"""
 # Black Crab Park Blog Bot - Posts every 3 days at 9 AM
@@ -190,18 +246,15 @@ def generate_cron_entry():
 
 def generate_systemd_service():
     """Generate systemd service file"""
-    script_path = Path(__file__).resolve()
-    python_path = sys.executable
-
     return f"""[Unit]
 Description=Black Crab Park Blog Bot
 After=network.target
 
 [Service]
 Type=simple
-User={os.getenv('USER', 'pi')}
-WorkingDirectory={script_path.parent}
-ExecStart={python_path} {script_path} --daemon
+User={_USER}
+WorkingDirectory={_SCRIPT_PATH.parent}
+ExecStart={_PYTHON} {_SCRIPT_PATH} --daemon
 Restart=on-failure
 RestartSec=60
 
@@ -5,8 +5,13 @@ Monitors system health, service availability, and data sync status.
 """
 
 import sys
+import threading
 import requests
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Dict, Any, List
 
 import firebase_admin
@@ -18,12 +23,39 @@ from logger import LogiLogger
 # Initialize logger
 logger = LogiLogger.get_logger("health_monitor")
 
+# Firestore collection paths (config is fixed at import)
+_DRIVERS_PATH = config.get_public_collection("drivers")
+_PLANTS_PATH = config.get_public_collection("plants")
+_SYNC_STATUS_PATH = config.get_public_collection("sync_status")
+_SYNC_STATUS_DOC = "sheets"  # Written by google_sheets_sync after every run
+
+# Pooled keep-alive connections for Ollama probes, with one quick retry
+_session = requests.Session()
+_session.mount('http://', HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=4,
+    max_retries=Retry(total=1, backoff_factor=0.1)
+))
+
+
+@lru_cache(maxsize=1)
+def _parse_utc(timestamp: str) -> datetime:
+    """Parse an ISO timestamp as naive UTC (the sync writes utcnow().isoformat())"""
+    if timestamp.endswith('Z'):
+        timestamp = timestamp[:-1]
+    parsed = datetime.fromisoformat(timestamp)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
 
 class HealthMonitor:
     """System health monitoring"""
 
     def __init__(self):
         self.db = None
+        self._sheets_service = None
+        self._client_lock = threading.Lock()  # Checks run concurrently
         self.checks = []
         logger.info("Health Monitor initialized")
 
@@ -35,10 +67,39 @@ class HealthMonitor:
             'critical': critical
         })
 
+    def _ensure_db(self):
+        """Initialize Firebase and the Firestore client once, then reuse it"""
+        with self._client_lock:
+            if self.db is None:
+                if not firebase_admin._apps:
+                    cred = credentials.Certificate(config.CREDENTIALS_PATH)
+                    firebase_admin.initialize_app(cred)
+                self.db = firestore.client()
+        return self.db
+
+    def _get_sheets(self):
+        """Build the authorized Sheets service once, then reuse it"""
+        with self._client_lock:
+            if self._sheets_service is None:
+                from google.oauth2 import service_account
+                from googleapiclient.discovery import build
+
+                creds = service_account.Credentials.from_service_account_file(
+                    config.CREDENTIALS_PATH,
+                    scopes=['https://www.googleapis.com/auth/spreadsheets.readonly']
+                )
+                # Bundled discovery document: no HTTP fetch when building
+                self._sheets_service = build(
+                    'sheets', 'v4', credentials=creds,
+                    static_discovery=True, cache_discovery=False
+                )
+        return self._sheets_service
+
     def check_ollama_service(self) -> Dict[str, Any]:
         """Check if Ollama service is running"""
         try:
-            response = requests.get(f"{config.OLLAMA_BASE_URL}/api/tags", timeout=5)
+            # (connect, read) timeouts: fail fast when nothing is listening
+            response = _session.get(f"{config.OLLAMA_BASE_URL}/api/tags", timeout=(1, 4))
             available = response.status_code == 200
 
             models = []
@@ -62,15 +123,10 @@ class HealthMonitor:
     def check_firebase_connection(self) -> Dict[str, Any]:
         """Check Firebase/Firestore connectivity"""
         try:
-            if not firebase_admin._apps:
-                cred = credentials.Certificate(config.CREDENTIALS_PATH)
-                firebase_admin.initialize_app(cred)
-
-            self.db = firestore.client()
+            self._ensure_db()
 
             # Try to read from a collection
-            collection_path = config.get_public_collection("drivers")
-            docs = self.db.collection(collection_path).limit(1).stream()
+            docs = self.db.collection(_DRIVERS_PATH).limit(1).stream()
             list(docs)  # Force execution
 
             return {
@@ -88,14 +144,7 @@ class HealthMonitor:
     def check_google_sheets_api(self) -> Dict[str, Any]:
         """Check Google Sheets API access"""
         try:
-            from google.oauth2 import service_account
-            from googleapiclient.discovery import build
-
-            creds = service_account.Credentials.from_service_account_file(
-                config.CREDENTIALS_PATH,
-                scopes=['https://www.googleapis.com/auth/spreadsheets.readonly']
-            )
-            service = build('sheets', 'v4', credentials=creds)
+            service = self._get_sheets()
 
             # Try to get sheet metadata
             metadata = service.spreadsheets().get(
@@ -118,28 +167,29 @@ class HealthMonitor:
     def check_last_sync_time(self) -> Dict[str, Any]:
         """Check when last sync occurred"""
         try:
-            if not self.db:
-                if not firebase_admin._apps:
-                    cred = credentials.Certificate(config.CREDENTIALS_PATH)
-                    firebase_admin.initialize_app(cred)
-                self.db = firestore.client()
+            self._ensure_db()
+
+            # The sheets sync records every finished run here; drivers'
+            # last_updated only moves when a row changes
+            status_doc = self.db.collection(_SYNC_STATUS_PATH).document(_SYNC_STATUS_DOC).get()
+            last_sync = (status_doc.to_dict() or {}).get('last_sync_at') if status_doc.exists else None
 
-            collection_path = config.get_public_collection("drivers")
-            docs = self.db.collection(collection_path).order_by(
-                'last_updated',
-                direction=firestore.Query.DESCENDING
-            ).limit(1).stream()
+            if not last_sync:
+                # No status document yet (sync from before it was recorded)
+                docs = self.db.collection(_DRIVERS_PATH).order_by(
+                    'last_updated',
+                    direction=firestore.Query.DESCENDING
+                ).limit(1).stream()
 
-            last_sync = None
-            for doc in docs:
-                data = doc.to_dict()
-                last_sync = data.get('last_updated')
-                break
+                for doc in docs:
+                    data = doc.to_dict()
+                    last_sync = data.get('last_updated')
+                    break
 
             if last_sync:
                 # Parse ISO timestamp
-                last_sync_dt = datetime.fromisoformat(last_sync.replace('Z', '+00:00'))
-                age_minutes = (datetime.utcnow().replace(tzinfo=last_sync_dt.tzinfo) - last_sync_dt).total_seconds() / 60
+                last_sync_dt = _parse_utc(last_sync)
+                age_minutes = (datetime.utcnow() - last_sync_dt).total_seconds() / 60
 
                 status = 'healthy'
                 if age_minutes > config.SYNC_INTERVAL_MINUTES * 2:
@@ -168,20 +218,11 @@ class HealthMonitor:
     def check_data_counts(self) -> Dict[str, Any]:
         """Check document counts in Firestore"""
         try:
-            if not self.db:
-                if not firebase_admin._apps:
-                    cred = credentials.Certificate(config.CREDENTIALS_PATH)
-                    firebase_admin.initialize_app(cred)
-                self.db = firestore.client()
-
-            drivers_path = config.get_public_collection("drivers")
-            plants_path = config.get_public_collection("plants")
-
-            driver_docs = list(self.db.collection(drivers_path).stream())
-            plant_docs = list(self.db.collection(plants_path).stream())
+            self._ensure_db()
 
-            driver_count = len(driver_docs)
-            plant_count = len(plant_docs)
+            # Aggregation queries: the server returns just the count
+            driver_count = self.db.collection(_DRIVERS_PATH).count().get()[0][0].value
+            plant_count = self.db.collection(_PLANTS_PATH).count().get()[0][0].value
 
             status = 'healthy'
             if driver_count == 0:
@@ -220,10 +261,17 @@ class HealthMonitor:
 
         critical_failures = 0
 
-        for check_name, check_func, critical in standard_checks:
-            try:
+        # Checks are independent and I/O-bound, so run them concurrently;
+        # results are still collected in the order above
+        with ThreadPoolExecutor(max_workers=len(standard_checks)) as executor:
+            futures = []
+            for check_name, check_func, critical in standard_checks:
                 logger.info(f"Running check: {check_name}")
-                result = check_func()
+                futures.append((check_name, critical, executor.submit(check_func)))
+
+        for check_name, critical, future in futures:
+            try:
+                result = future.result()
                 results['checks'][check_name] = result
 
                 if result['status'] == 'unhealthy' and critical:
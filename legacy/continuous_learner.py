@@ -5,11 +5,19 @@ Automatically retrains models when new operational data is available.
 Runs on schedule to keep AI current with latest dispatch patterns.
 """
 
+import json
+import logging
+import os
+import signal
+import threading
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, Any
 
+import requests
+
+from config import config
 from training_data_builder import TrainingDataBuilder
 from model_trainer import ModelTrainer
 from model_manager import ModelManager
@@ -17,6 +25,14 @@ from logger import LogiLogger
 
 logger = LogiLogger.get_logger("continuous_learner")
 
+SEPARATOR = "=" * 60
+
+# Minimum seconds between full tracebacks for failed cycles (unless DEBUG)
+TRACEBACK_INTERVAL = 600
+
+# Seconds that fetched driver/plant counts are reused by check_new_data
+DATA_CACHE_TTL = 300
+
 
 class ContinuousLearner:
     """Automated continuous learning pipeline"""
@@ -39,31 +55,47 @@ class ContinuousLearner:
         self.last_train_time = None
         self.load_state()
 
-        logger.info(f"Continuous Learner initialized")
-        logger.info(f"Retrain interval: {retrain_interval_days} days")
-        logger.info(f"Min new examples: {min_new_examples}")
-        logger.info(f"Auto-deploy: {auto_deploy}")
+        # Most recent driver/plant record counts and when they were fetched
+        self._data_cache = {"ts": None, "drivers": 0, "plants": 0}
+
+        # Set to cut the wait between cycles short (e.g. by SIGUSR1)
+        self._wake = threading.Event()
+        self._last_traceback = None
+
+        logger.info("Continuous Learner initialized")
+        logger.info("Retrain interval: %s days", retrain_interval_days)
+        logger.info("Min new examples: %s", min_new_examples)
+        logger.info("Auto-deploy: %s", auto_deploy)
 
     def load_state(self):
         """Load last training timestamp"""
         state_file = self.data_builder.output_dir / "learner_state.json"
 
         if state_file.exists():
-            import json
             with open(state_file) as f:
                 state = json.load(f)
-                self.last_train_time = datetime.fromisoformat(state.get("last_train_time"))
-                logger.info(f"Last training: {self.last_train_time}")
-
-    def save_state(self):
-        """Save training state"""
-        import json
+                last_train_time = datetime.fromisoformat(state.get("last_train_time"))
+                if last_train_time.tzinfo is None:
+                    # Older state files stored naive UTC timestamps
+                    last_train_time = last_train_time.replace(tzinfo=timezone.utc)
+                self.last_train_time = last_train_time
+                logger.info("Last training: %s", self.last_train_time)
+
+    def save_state(self, trained_at: datetime = None):
+        """Save training state (atomically, via a temp file and rename)"""
         state_file = self.data_builder.output_dir / "learner_state.json"
+        tmp_file = state_file.with_suffix('.json.tmp')
 
-        with open(state_file, 'w') as f:
-            json.dump({
-                "last_train_time": datetime.utcnow().isoformat()
-            }, f, indent=2)
+        data = json.dumps({
+            "last_train_time": (trained_at or datetime.now(timezone.utc)).isoformat()
+        }, separators=(',', ':')).encode()
+
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+        os.replace(tmp_file, state_file)
 
     def should_retrain(self) -> bool:
         """Determine if retraining is needed"""
@@ -71,13 +103,13 @@ class ContinuousLearner:
             logger.info("First training run")
             return True
 
-        time_since_last = datetime.utcnow() - self.last_train_time
+        time_since_last = datetime.now(timezone.utc) - self.last_train_time
 
         if time_since_last >= self.retrain_interval:
-            logger.info(f"Retrain interval reached ({time_since_last.days} days)")
+            logger.info("Retrain interval reached (%s days)", time_since_last.days)
             return True
 
-        logger.info(f"Next retrain in {(self.retrain_interval - time_since_last).days} days")
+        logger.info("Next retrain in %s days", (self.retrain_interval - time_since_last).days)
         return False
 
     def check_new_data(self) -> int:
@@ -86,22 +118,28 @@ class ContinuousLearner:
         # For now, return a placeholder
         logger.info("Checking for new operational data...")
 
-        # Count new driver/plant records
-        self.data_builder.initialize_firebase()
-        drivers = self.data_builder.fetch_driver_data()
-        plants = self.data_builder.fetch_plant_data()
+        # Count new driver/plant records (reusing a recent fetch if there is one)
+        cache = self._data_cache
+        if cache["ts"] is None or time.monotonic() - cache["ts"] >= DATA_CACHE_TTL:
+            if self.data_builder.db is None:
+                self.data_builder.initialize_firebase()
+            cache["drivers"] = len(self.data_builder.fetch_driver_data())
+            cache["plants"] = len(self.data_builder.fetch_plant_data())
+            cache["ts"] = time.monotonic()
 
         # Rough estimate of new examples
-        new_examples = len(drivers) * 3 + len(plants)  # 3 examples per driver
+        new_examples = cache["drivers"] * 3 + cache["plants"]  # 3 examples per driver
 
-        logger.info(f"Estimated new examples: {new_examples}")
+        logger.info("Estimated new examples: %s", new_examples)
         return new_examples
 
     def run_training_cycle(self) -> bool:
         """Execute full training cycle"""
-        logger.info("=" * 60)
+        logger.info(SEPARATOR)
         logger.info("STARTING CONTINUOUS LEARNING CYCLE")
-        logger.info("=" * 60)
+        logger.info(SEPARATOR)
+
+        now = datetime.now(timezone.utc)
 
         try:
             # Step 1: Build fresh datasets
@@ -116,19 +154,20 @@ class ContinuousLearner:
                 logger.error("Training failed")
                 return False
 
-            # Step 3: Get latest model name
-            import subprocess
-            result = subprocess.run(
-                ["ollama", "list"],
-                capture_output=True,
-                text=True
+            # Step 3: Get latest model name from the Ollama API
+            response = requests.get(f"{config.OLLAMA_BASE_URL}/api/tags", timeout=5)
+            response.raise_for_status()
+            models = sorted(
+                response.json().get("models", []),
+                key=lambda m: m.get("modified_at", ""),
+                reverse=True
             )
 
             # Find latest legacy-ai model
             latest_model = None
-            for line in result.stdout.split('\n'):
-                if 'legacy-ai-srm' in line:
-                    latest_model = line.split()[0]
+            for model in models:
+                if 'legacy-ai-srm' in model.get("name", ""):
+                    latest_model = model["name"]
                     break
 
             if not latest_model:
@@ -136,13 +175,13 @@ class ContinuousLearner:
                 return False
 
             # Step 4: Register model
-            logger.info(f"Step 3: Registering model {latest_model}...")
+            logger.info("Step 3: Registering model %s...", latest_model)
             self.model_manager.register_model(
                 latest_model,
                 {
                     "training_method": "continuous_learning",
                     "datasets": datasets,
-                    "trained_at": datetime.utcnow().isoformat()
+                    "trained_at": now.isoformat()
                 },
                 set_active=self.auto_deploy
             )
@@ -151,35 +190,49 @@ class ContinuousLearner:
             if self.auto_deploy:
                 logger.info("Step 4: Auto-deploying model to production...")
                 self.model_manager.set_active_model(latest_model)
-                logger.info(f"✓ Model deployed: {latest_model}")
+                logger.info("✓ Model deployed: %s", latest_model)
             else:
                 logger.info("Manual deployment required")
-                logger.info(f"To deploy: python3 model_manager.py set-active {latest_model}")
+                logger.info("To deploy: python3 model_manager.py set-active %s", latest_model)
 
             # Save state
-            self.save_state()
-            self.last_train_time = datetime.utcnow()
+            self.save_state(now)
+            self.last_train_time = now
 
-            logger.info("=" * 60)
+            logger.info(SEPARATOR)
             logger.info("CONTINUOUS LEARNING CYCLE COMPLETE")
-            logger.info("=" * 60)
+            logger.info(SEPARATOR)
 
             return True
 
         except Exception as e:
-            logger.error(f"Training cycle failed: {e}", exc_info=True)
+            logger.error(
+                "Training cycle failed: %s: %s", type(e).__name__, e,
+                exc_info=self._should_log_traceback()
+            )
             return False
 
+    def _should_log_traceback(self) -> bool:
+        """Allow a full traceback at DEBUG level, otherwise once per TRACEBACK_INTERVAL"""
+        if logger.isEnabledFor(logging.DEBUG):
+            return True
+
+        now = time.monotonic()
+        if self._last_traceback is None or now - self._last_traceback >= TRACEBACK_INTERVAL:
+            self._last_traceback = now
+            return True
+        return False
+
     def run_once(self):
         """Run single learning cycle"""
         if self.should_retrain():
             new_examples = self.check_new_data()
 
             if new_examples >= self.min_new_examples:
-                logger.info(f"Sufficient new data ({new_examples} examples) - starting training")
+                logger.info("Sufficient new data (%s examples) - starting training", new_examples)
                 return self.run_training_cycle()
             else:
-                logger.info(f"Insufficient new data ({new_examples}/{self.min_new_examples}) - skipping")
+                logger.info("Insufficient new data (%s/%s) - skipping", new_examples, self.min_new_examples)
                 return False
         else:
             logger.info("Retrain interval not reached - skipping")
@@ -187,22 +240,42 @@ class ContinuousLearner:
 
     def run_continuous(self, check_interval_hours: int = 24):
         """Run continuous learning loop"""
-        logger.info(f"Starting continuous learning mode (check every {check_interval_hours}h)")
+        logger.info("Starting continuous learning mode (check every %sh)", check_interval_hours)
+
+        # `kill -USR1 <pid>` triggers a cycle now instead of at the next check
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, lambda signum, frame: self.wake())
 
+        forced = False
         while True:
             try:
-                self.run_once()
+                if forced:
+                    self.run_training_cycle()
+                else:
+                    self.run_once()
 
                 # Wait for next check
-                logger.info(f"Sleeping for {check_interval_hours} hours...")
-                time.sleep(check_interval_hours * 3600)
+                logger.info("Sleeping for %s hours...", check_interval_hours)
+                forced = self._wait(check_interval_hours * 3600)
 
             except KeyboardInterrupt:
                 logger.info("Continuous learning stopped by user")
                 break
             except Exception as e:
-                logger.error(f"Error in continuous loop: {e}")
-                time.sleep(3600)  # Wait 1 hour on error
+                logger.error("Error in continuous loop: %s", e)
+                forced = self._wait(3600)  # Wait 1 hour on error
+
+    def wake(self):
+        """Run a training cycle now, skipping the interval and new-data checks"""
+        self._wake.set()
+
+    def _wait(self, seconds: float) -> bool:
+        """Sleep between cycles; returns True if woken early"""
+        if self._wake.wait(seconds):
+            self._wake.clear()
+            logger.info("Woken early - starting training cycle")
+            return True
+        return False
 
 
 def main():
@@ -6,25 +6,55 @@ Haul Rate Formula: $130 / 60 mins * Round Trip Minutes / 25 tons
 Round up to nearest $0.50, minimum $6.00
 """
 
-import math
+import hashlib
+import re
 import sys
+import threading
 from datetime import datetime
-from typing import Optional, Dict, List, Any
-
-import firebase_admin
-from firebase_admin import credentials, firestore
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+from typing import TYPE_CHECKING, Optional, Dict, List, Any, Tuple
 
+# firebase_admin and googleapiclient are imported inside the functions that
+# use them, so importing this module (e.g. for calculate_haul_rate) stays cheap
 from config import config
 from logger import LogiLogger, log_execution, log_sync_event, log_haul_rate_calculation
 
+if TYPE_CHECKING:
+    from firebase_admin import firestore
+
 # Initialize logger
 logger = LogiLogger.get_logger("sheets_sync")
 
 # Constants
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
+# Only the columns the sync reads (A:C), or A:J when raw_data is stored
+_LAST_COLUMN = 'J' if config.STORE_RAW_DEBUG else 'C'
+DRIVERS_RANGE = f"Drivers!A2:{_LAST_COLUMN}"
+PLANTS_RANGE = f"Plants!A2:{_LAST_COLUMN}"
+WRITE_MAX_ATTEMPTS = 5  # Per-document attempts before a queued write counts as an error
+
+# Firestore collection paths (config is fixed at import)
+_DRIVERS_PATH = config.get_public_collection("drivers")
+_PLANTS_PATH = config.get_public_collection("plants")
+_SYNC_STATUS_PATH = config.get_public_collection("sync_status")
+
+# Document in the sync_status collection recording the last finished run
+SYNC_STATUS_DOC = "sheets"
+
+# Field holding a digest of each document's synced content; rows whose digest
+# matches the stored one are not rewritten
+_HASH_FIELD = 'content_hash'
+
+# Characters not allowed in Firestore document IDs built from driver names
+_DOC_ID_TRANS = str.maketrans({' ': '_', '/': '_', '.': '_'})
+
+# Plain decimal numbers (what float() accepts from a typical RTM cell)
+_NUM_RE = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)')
+
+# Haul rate formula in cents: BASE * 100 * RTM / (TIME_BASE * TON_BASE)
+_RATE_NUM = config.HAUL_RATE_BASE * 100
+_RATE_DEN = config.HAUL_RATE_TIME_BASE * config.HAUL_RATE_TON_BASE
+_CENTS_PER_INCREMENT = int(round(config.HAUL_RATE_ROUND_INCREMENT * 100))
+_RATE_MINIMUM = config.HAUL_RATE_MINIMUM
 
 
 def calculate_haul_rate(round_trip_minutes: float) -> float:
@@ -34,21 +64,23 @@ def calculate_haul_rate(round_trip_minutes: float) -> float:
     Round up to nearest INCREMENT, minimum MINIMUM
     """
     if not round_trip_minutes or round_trip_minutes <= 0:
-        return config.HAUL_RATE_MINIMUM
+        return _RATE_MINIMUM
 
-    rate = (config.HAUL_RATE_BASE / config.HAUL_RATE_TIME_BASE) * round_trip_minutes / config.HAUL_RATE_TON_BASE
+    cents = _RATE_NUM * round_trip_minutes / _RATE_DEN
 
-    # Round up to nearest INCREMENT
-    increment_inverse = 1.0 / config.HAUL_RATE_ROUND_INCREMENT
-    rate = math.ceil(rate * increment_inverse) / increment_inverse
+    # Round up to nearest INCREMENT (ceiling division on whole cents)
+    rate = -(-cents // _CENTS_PER_INCREMENT) * _CENTS_PER_INCREMENT / 100.0
 
     # Enforce minimum
-    return max(rate, config.HAUL_RATE_MINIMUM)
+    return rate if rate >= _RATE_MINIMUM else _RATE_MINIMUM
 
 
 @log_execution
-def init_firebase() -> firestore.Client:
+def init_firebase() -> "firestore.Client":
     """Initialize Firebase Admin SDK with error handling"""
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+
     try:
         if not firebase_admin._apps:
             logger.info(f"Initializing Firebase with credentials: {config.CREDENTIALS_PATH}")
@@ -63,48 +95,139 @@ def init_firebase() -> firestore.Client:
 @log_execution
 def get_sheets_service():
     """Initialize Google Sheets API service with error handling"""
+    from google.oauth2 import service_account
+    from googleapiclient.discovery import build
+
     try:
         logger.info(f"Initializing Google Sheets API with credentials: {config.CREDENTIALS_PATH}")
         creds = service_account.Credentials.from_service_account_file(
             config.CREDENTIALS_PATH, scopes=SCOPES
         )
-        return build('sheets', 'v4', credentials=creds)
+        # Bundled discovery document: no HTTP fetch when building
+        return build(
+            'sheets', 'v4', credentials=creds,
+            static_discovery=True, cache_discovery=False
+        )
     except Exception as e:
         logger.error(f"Failed to initialize Google Sheets API: {e}")
         raise
 
 
 @log_execution
-def sync_drivers(sheets_service, db) -> Dict[str, Any]:
+def fetch_sheet_ranges(sheets_service, ranges: List[str]) -> Dict[str, List[List[str]]]:
+    """
+    Fetch several ranges of the dispatch sheet in one values.batchGet call.
+    Returns rows keyed by the requested range name. If the batch is rejected
+    because a range doesn't exist, the ranges are fetched one by one and the
+    missing ones are left out of the result.
+    """
+    from googleapiclient.errors import HttpError
+
+    logger.info(f"Fetching {', '.join(ranges)} from sheet: {config.SRM_DISPATCH_SHEET_ID}")
+    try:
+        result = sheets_service.spreadsheets().values().batchGet(
+            spreadsheetId=config.SRM_DISPATCH_SHEET_ID,
+            ranges=ranges
+        ).execute()
+        # valueRanges come back in request order
+        return {
+            range_name: value_range.get('values', [])
+            for range_name, value_range in zip(ranges, result.get('valueRanges', []))
+        }
+    except HttpError as e:
+        if e.resp.status not in (400, 404):
+            raise
+
+    sheet_data = {}
+    for range_name in ranges:
+        try:
+            result = sheets_service.spreadsheets().values().get(
+                spreadsheetId=config.SRM_DISPATCH_SHEET_ID,
+                range=range_name
+            ).execute()
+            sheet_data[range_name] = result.get('values', [])
+        except HttpError as e:
+            if e.resp.status not in (400, 404):
+                raise
+            logger.warning(f"Range not found in sheet: {range_name}")
+    return sheet_data
+
+
+def _bulk_writer(db, stats: Dict[str, Any]):
+    """
+    Create a Firestore BulkWriter whose results are tallied into stats.
+    Writes are batched and sent from the writer's own threads, so 'synced'
+    and 'errors' are counted from its callbacks rather than at enqueue time.
+    """
+    lock = threading.Lock()
+    bulk_writer = db.bulk_writer()
+
+    def on_result(reference, result, writer):
+        with lock:
+            stats['synced'] += 1
+
+    def on_error(failure, writer) -> bool:
+        if failure.attempts < WRITE_MAX_ATTEMPTS:
+            return True
+        with lock:
+            stats['errors'] += 1
+        logger.error(f"Firestore write failed after {failure.attempts} attempts: {failure.message}")
+        return False
+
+    bulk_writer.on_write_result(on_result)
+    bulk_writer.on_write_error(on_error)
+    return bulk_writer
+
+
+def _content_hash(data: Dict[str, Any]) -> str:
+    """Digest of a document's synced fields (built before last_updated is added)"""
+    return hashlib.blake2b(repr(data).encode(), digest_size=8).hexdigest()
+
+
+def _stored_hashes(collection) -> Dict[str, Optional[str]]:
+    """Content hash of every document in collection, read in one projected query"""
+    return {
+        doc.id: (doc.to_dict() or {}).get(_HASH_FIELD)
+        for doc in collection.select([_HASH_FIELD]).stream()
+    }
+
+
+@log_execution
+def sync_drivers(sheets_service, db, rows: Optional[List[List[str]]] = None) -> Dict[str, Any]:
     """
     Pull driver data from Google Sheets and sync to Firestore.
     Expected columns: Driver Name, Round Trip Minutes, Status, etc.
+    Pass rows already fetched with fetch_sheet_ranges to skip the Sheets call.
     Returns sync statistics.
     """
+    from googleapiclient.errors import HttpError
+
     stats = {
         'synced': 0,
         'errors': 0,
-        'skipped': 0
+        'skipped': 0,
+        'unchanged': 0
     }
 
-    # Adjust range based on actual sheet structure
-    range_name = "Drivers!A2:Z"
-    collection_path = config.get_public_collection("drivers")
-
     try:
-        logger.info(f"Fetching driver data from sheet: {config.SRM_DISPATCH_SHEET_ID}")
-        result = sheets_service.spreadsheets().values().get(
-            spreadsheetId=config.SRM_DISPATCH_SHEET_ID,
-            range=range_name
-        ).execute()
-
-        rows = result.get('values', [])
+        if rows is None:
+            logger.info(f"Fetching driver data from sheet: {config.SRM_DISPATCH_SHEET_ID}")
+            result = sheets_service.spreadsheets().values().get(
+                spreadsheetId=config.SRM_DISPATCH_SHEET_ID,
+                range=DRIVERS_RANGE
+            ).execute()
+            rows = result.get('values', [])
 
         if not rows:
             logger.warning("No driver data found in sheet")
             return stats
 
         logger.info(f"Processing {len(rows)} driver rows")
+        # Every document in this sync shares one timestamp
+        last_updated = datetime.utcnow().isoformat()
+        collection = db.collection(_DRIVERS_PATH)
+        stored_hashes = _stored_hashes(collection)
+        bulk_writer = _bulk_writer(db, stats)
 
         for idx, row in enumerate(rows, start=2):
             try:
@@ -117,11 +240,14 @@ def sync_drivers(sheets_service, db) -> Dict[str, Any]:
                     stats['skipped'] += 1
                     continue
 
-                # Parse round trip minutes (adjust column index as needed)
-                try:
-                    round_trip_minutes = float(row[1]) if len(row) > 1 and row[1] else 0
-                except (ValueError, TypeError):
-                    logger.warning(f"Invalid RTM for {driver_name} at row {idx}: {row[1]}")
+                # Parse round trip minutes (adjust column index as needed);
+                # blank or dash cells are common, so check before float()
+                rtm_cell = row[1].strip()
+                if _NUM_RE.fullmatch(rtm_cell):
+                    round_trip_minutes = float(rtm_cell)
+                else:
+                    if rtm_cell:
+                        logger.warning(f"Invalid RTM for {driver_name} at row {idx}: {row[1]}")
                     round_trip_minutes = 0
 
                 # Calculate haul rate
@@ -134,23 +260,33 @@ def sync_drivers(sheets_service, db) -> Dict[str, Any]:
                     'round_trip_minutes': round_trip_minutes,
                     'haul_rate': haul_rate,
                     'status': row[2].strip() if len(row) > 2 and row[2] else 'active',
-                    'last_updated': datetime.utcnow().isoformat(),
-                    'sheet_row': idx,
-                    'raw_data': row[:10]  # Store first 10 columns for debugging
+                    'sheet_row': idx
                 }
+                if config.STORE_RAW_DEBUG:
+                    driver_data['raw_data'] = row[:10]  # Store first 10 columns for debugging
 
                 # Use driver name as document ID (sanitize for Firestore)
-                doc_id = driver_name.replace(' ', '_').replace('/', '_').replace('.', '_')
+                doc_id = driver_name.translate(_DOC_ID_TRANS)
+
+                # Skip the write if the document already holds this content
+                content_hash = _content_hash(driver_data)
+                if stored_hashes.get(doc_id) == content_hash:
+                    stats['unchanged'] += 1
+                    continue
+                driver_data['last_updated'] = last_updated
+                driver_data[_HASH_FIELD] = content_hash
 
-                # Write to Firestore
-                db.collection(collection_path).document(doc_id).set(driver_data)
-                stats['synced'] += 1
-                logger.debug(f"Synced driver: {driver_name} -> ${haul_rate:.2f}")
+                # Queue Firestore write
+                bulk_writer.set(collection.document(doc_id), driver_data)
+                logger.debug(f"Queued driver: {driver_name} -> ${haul_rate:.2f}")
 
             except Exception as e:
                 stats['errors'] += 1
                 logger.error(f"Error syncing driver at row {idx}: {e}")
 
+        # Send any partial batch and wait for every queued write to settle
+        bulk_writer.flush()
+
         log_sync_event("drivers", stats)
         logger.info(f"Driver sync complete: {stats}")
 
@@ -165,36 +301,41 @@ def sync_drivers(sheets_service, db) -> Dict[str, Any]:
 
 
 @log_execution
-def sync_plants(sheets_service, db) -> Dict[str, Any]:
+def sync_plants(sheets_service, db, rows: Optional[List[List[str]]] = None) -> Dict[str, Any]:
     """
     Pull plant codes from Google Sheets and sync to Firestore.
     Expected columns: Plant Code, Plant Name, Location, etc.
+    Pass rows already fetched with fetch_sheet_ranges to skip the Sheets call.
     Returns sync statistics.
     """
+    from googleapiclient.errors import HttpError
+
     stats = {
         'synced': 0,
         'errors': 0,
-        'skipped': 0
+        'skipped': 0,
+        'unchanged': 0
     }
 
-    # Adjust range based on actual sheet structure
-    range_name = "Plants!A2:Z"
-    collection_path = config.get_public_collection("plants")
-
     try:
-        logger.info(f"Fetching plant data from sheet: {config.SRM_DISPATCH_SHEET_ID}")
-        result = sheets_service.spreadsheets().values().get(
-            spreadsheetId=config.SRM_DISPATCH_SHEET_ID,
-            range=range_name
-        ).execute()
-
-        rows = result.get('values', [])
+        if rows is None:
+            logger.info(f"Fetching plant data from sheet: {config.SRM_DISPATCH_SHEET_ID}")
+            result = sheets_service.spreadsheets().values().get(
+                spreadsheetId=config.SRM_DISPATCH_SHEET_ID,
+                range=PLANTS_RANGE
+            ).execute()
+            rows = result.get('values', [])
 
         if not rows:
             logger.warning("No plant data found in sheet")
             return stats
 
         logger.info(f"Processing {len(rows)} plant rows")
+        # Every document in this sync shares one timestamp
+        last_updated = datetime.utcnow().isoformat()
+        collection = db.collection(_PLANTS_PATH)
+        stored_hashes = _stored_hashes(collection)
+        bulk_writer = _bulk_writer(db, stats)
 
         for idx, row in enumerate(rows, start=2):
             try:
@@ -211,20 +352,29 @@ def sync_plants(sheets_service, db) -> Dict[str, Any]:
                     'code': plant_code,
                     'name': row[1].strip() if len(row) > 1 and row[1] else '',
                     'location': row[2].strip() if len(row) > 2 and row[2] else '',
-                    'last_updated': datetime.utcnow().isoformat(),
-                    'sheet_row': idx,
-                    'raw_data': row[:10]
+                    'sheet_row': idx
                 }
+                if config.STORE_RAW_DEBUG:
+                    plant_data['raw_data'] = row[:10]
 
-                # Write to Firestore
-                db.collection(collection_path).document(plant_code).set(plant_data)
-                stats['synced'] += 1
-                logger.debug(f"Synced plant: {plant_code}")
+                # Skip the write if the document already holds this content
+                content_hash = _content_hash(plant_data)
+                if stored_hashes.get(plant_code) == content_hash:
+                    stats['unchanged'] += 1
+                    continue
+                plant_data['last_updated'] = last_updated
+                plant_data[_HASH_FIELD] = content_hash
+
+                # Queue Firestore write
+                bulk_writer.set(collection.document(plant_code), plant_data)
+                logger.debug(f"Queued plant: {plant_code}")
 
             except Exception as e:
                 stats['errors'] += 1
                 logger.error(f"Error syncing plant at row {idx}: {e}")
 
+        bulk_writer.flush()
+
         log_sync_event("plants", stats)
         logger.info(f"Plant sync complete: {stats}")
 
@@ -241,6 +391,33 @@ def sync_plants(sheets_service, db) -> Dict[str, Any]:
     return stats
 
 
+def record_sync_status(db, driver_stats: Dict[str, Any], plant_stats: Dict[str, Any]):
+    """
+    Record that a sync run finished. Unchanged rows keep their old
+    last_updated, so health_monitor reads last_sync_at from here instead.
+    """
+    db.collection(_SYNC_STATUS_PATH).document(SYNC_STATUS_DOC).set({
+        'last_sync_at': datetime.utcnow().isoformat(),
+        'drivers': driver_stats,
+        'plants': plant_stats
+    })
+
+
+def run_full_sync(sheets_service, db) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Sync drivers and plants from one batched sheet fetch, then record the
+    run in sync_status. Every sync entry point (this script, the LogiBot
+    daemon, the webhook) goes through here. Returns (driver_stats, plant_stats).
+    """
+    # A range missing from the batch is fetched on its own so the sync
+    # functions report it as before
+    sheet_data = fetch_sheet_ranges(sheets_service, [DRIVERS_RANGE, PLANTS_RANGE])
+    driver_stats = sync_drivers(sheets_service, db, rows=sheet_data.get(DRIVERS_RANGE))
+    plant_stats = sync_plants(sheets_service, db, rows=sheet_data.get(PLANTS_RANGE))
+    record_sync_status(db, driver_stats, plant_stats)
+    return driver_stats, plant_stats
+
+
 @log_execution
 def main():
     """Main sync execution"""
@@ -259,9 +436,8 @@ def main():
         db = init_firebase()
         sheets_service = get_sheets_service()
 
-        # Run sync operations
-        driver_stats = sync_drivers(sheets_service, db)
-        plant_stats = sync_plants(sheets_service, db)
+        # Fetch both tabs in one round trip, then run sync operations
+        driver_stats, plant_stats = run_full_sync(sheets_service, db)
 
         # Summary
         total_synced = driver_stats['synced'] + plant_stats['synced']
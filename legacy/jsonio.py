@@ -0,0 +1,85 @@
+"""
+JSON helpers for the Legacy AI modules
+
+Uses orjson (C extension) when installed and falls back to the stdlib
+json module. loads accepts bytes or str; dumps returns compact bytes and
+dumps_pretty 2-space indented bytes (for files people read).
+read_generate_stream merges a streamed Ollama reply into one result.
+write_atomic durably replaces a file with serialized bytes.
+"""
+
+import os
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
+
+
+if ORJSON_AVAILABLE:
+    def dumps(obj) -> bytes:
+        """Serialize obj to compact JSON bytes"""
+        return orjson.dumps(obj)
+
+    def dumps_pretty(obj) -> bytes:
+        """Serialize obj to JSON bytes indented by 2 spaces"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    loads = orjson.loads
+else:
+    def dumps(obj) -> bytes:
+        """Serialize obj to compact JSON bytes"""
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+    def dumps_pretty(obj) -> bytes:
+        """Serialize obj to JSON bytes indented by 2 spaces"""
+        return json.dumps(obj, indent=2).encode()
+
+    loads = json.loads
+
+
+def write_atomic(path, data: bytes):
+    """
+    Replace path with data: one write to a temp file, fsync, rename over
+    path, then fsync the directory so the rename itself survives a crash.
+    """
+    tmp_file = path.with_suffix(path.suffix + '.tmp')
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_file, path)
+
+    dir_fd = os.open(path.parent, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+# Read size for streamed Ollama replies. Chunked responses are still handed
+# over as each chunk arrives, so a large size adds no latency; it keeps a long
+# line (e.g. the final chunk's context array) from being rebuilt 512 bytes at a
+# time by iter_lines' default
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def read_generate_stream(response) -> dict:
+    """
+    Read a streamed Ollama /api/generate reply (one JSON object per line).
+    Returns the final "done" chunk with "response" set to the full text.
+    """
+    parts = []
+    final = {}
+    for line in response.iter_lines(chunk_size=STREAM_CHUNK_SIZE):
+        if line:
+            chunk = loads(line)
+            parts.append(chunk.get("response", ""))
+            if chunk.get("done"):
+                final = chunk
+    final["response"] = "".join(parts)
+    return final
@@ -5,20 +5,45 @@ Custom AI assistant with persistent memory and operational context.
 Uses locally trained models from 8TB drive.
 """
 
-import json
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 import firebase_admin
 from firebase_admin import credentials, firestore
 
 from config import config
 from logger import LogiLogger
+import jsonio
 
 logger = LogiLogger.get_logger("legacy_ai")
 
+# Seconds the active-driver list is reused before Firestore is read again
+DRIVERS_CACHE_TTL = 30
+
+# Streamed tokens are yielded in batches that grow from min_batch_size by
+# growth_factor up to max_batch_size; a batch older than this many seconds
+# is yielded early so slow generations still print promptly
+STREAM_FLUSH_INTERVAL = 0.05
+
+# Upper bound on queries batch_query keeps in flight (well under the
+# session's pool_maxsize; Ollama queues anything beyond its own parallelism)
+BATCH_QUERY_WORKERS = 8
+
+# Pooled keep-alive connections to Ollama, shared by every LegacyAI instance
+_session = requests.Session()
+_session.mount('http://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+))
+
 
 class LegacyAI:
     """Production-ready AI assistant with operational memory"""
@@ -36,6 +61,8 @@ class LegacyAI:
         self.ollama_url = ollama_url or config.OLLAMA_BASE_URL
         self.db = None
         self.conversation_history = []
+        self.last_context = None  # Ollama context tokens carried between interactive turns
+        self._drivers_cache = {"ts": None, "drivers": []}
         self.session_id = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
 
         logger.info(f"Legacy AI initialized: {model_name}")
@@ -50,33 +77,38 @@ class LegacyAI:
         logger.info("Firestore connected for real-time data access")
 
     def get_active_drivers(self) -> List[Dict[str, Any]]:
-        """Get current active drivers from Firestore"""
-        collection_path = config.get_public_collection("drivers")
-        docs = self.db.collection(collection_path).stream()
+        """Get current active drivers from Firestore (cached for DRIVERS_CACHE_TTL seconds)"""
+        cache = self._drivers_cache
+        if cache["ts"] is not None and time.monotonic() - cache["ts"] < DRIVERS_CACHE_TTL:
+            return cache["drivers"]
 
-        drivers = []
-        for doc in docs:
-            data = doc.to_dict()
-            if data.get('status') == 'active':
-                drivers.append(data)
+        collection_path = config.get_public_collection("drivers")
+        # Filter server-side so inactive drivers are never transferred; the sort
+        # stays local since order_by('haul_rate') would need a composite index
+        # and would drop drivers that have no haul_rate yet
+        docs = self.db.collection(collection_path).where('status', '==', 'active').stream()
+        drivers = [doc.to_dict() for doc in docs]
 
-        return sorted(drivers, key=lambda d: d.get('haul_rate', 999))
+        cache["drivers"] = sorted(drivers, key=lambda d: d.get('haul_rate', 999))
+        cache["ts"] = time.monotonic()
+        return cache["drivers"]
 
     def get_operational_context(self) -> str:
         """Build context string with current operational data"""
         drivers = self.get_active_drivers()
 
-        context = "CURRENT OPERATIONAL STATUS:\n\n"
-        context += f"Active Drivers: {len(drivers)}\n\n"
+        parts = ["CURRENT OPERATIONAL STATUS:\n\n", f"Active Drivers: {len(drivers)}\n\n"]
 
         if drivers:
-            context += "Top 5 Cost-Effective Drivers:\n"
-            for i, driver in enumerate(drivers[:5], 1):
-                context += f"{i}. {driver['name']} - ${driver['haul_rate']:.2f} ({driver['round_trip_minutes']} min RTM)\n"
+            parts.append("Top 5 Cost-Effective Drivers:\n")
+            parts.extend(
+                f"{i}. {driver['name']} - ${driver['haul_rate']:.2f} ({driver['round_trip_minutes']} min RTM)\n"
+                for i, driver in enumerate(drivers[:5], 1)
+            )
 
-        context += f"\nTimestamp: {datetime.utcnow().isoformat()}\n"
+        parts.append(f"\nTimestamp: {datetime.utcnow().isoformat()}\n")
 
-        return context
+        return "".join(parts)
 
     def query(
         self,
@@ -106,47 +138,100 @@ class LegacyAI:
         logger.info(f"Query: {prompt[:100]}...")
 
         try:
-            # Call Ollama API
-            response = requests.post(
+            # Call Ollama API; the reply is streamed and merged here because
+            # Ollama's buffered (stream: false) path can stall long generations
+            # (the with block returns the pooled connection on every path)
+            with _session.post(
                 f"{self.ollama_url}/api/generate",
                 json={
                     "model": self.model_name,
                     "prompt": full_prompt,
-                    "stream": False,
+                    "stream": True,
                     "options": {
                         "temperature": temperature,
                         "num_ctx": 4096
                     }
                 },
+                stream=True,
                 timeout=120
-            )
+            ) as response:
+                if response.status_code != 200:
+                    logger.error(f"Ollama API error: {response.status_code}")
+                    return None
+                result = jsonio.read_generate_stream(response)
+
+            ai_response = result.get("response", "")
+
+            # Save to conversation history
+            self.conversation_history.append({
+                "timestamp": datetime.utcnow().isoformat(),
+                "prompt": prompt,
+                "response": ai_response,
+                "model": self.model_name
+            })
 
-            if response.status_code == 200:
-                result = response.json()
-                ai_response = result.get("response", "")
-
-                # Save to conversation history
-                self.conversation_history.append({
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "prompt": prompt,
-                    "response": ai_response,
-                    "model": self.model_name
-                })
-
-                logger.info(f"Response generated ({len(ai_response)} chars)")
-                return ai_response
-            else:
-                logger.error(f"Ollama API error: {response.status_code}")
-                return None
-
-        except requests.RequestException as e:
+            logger.info(f"Response generated ({len(ai_response)} chars)")
+            return ai_response
+
+        except (requests.RequestException, ValueError) as e:
             logger.error(f"Failed to query model: {e}")
             return None
 
-    def stream_query(self, prompt: str, include_context: bool = True):
+    def batch_query(
+        self,
+        prompts: List[str],
+        include_context: bool = True,
+        temperature: float = 0.3
+    ) -> List[Optional[str]]:
+        """
+        Run several queries concurrently.
+
+        Ollama serves up to OLLAMA_NUM_PARALLEL requests per loaded model at
+        once, so overlapping the requests takes about as long as the slowest
+        one instead of the sum of all of them.
+
+        Args:
+            prompts: User queries
+            include_context: Include real-time operational data
+            temperature: Model temperature (0.0-1.0)
+
+        Returns:
+            Responses (None on error), in the same order as prompts
+        """
+        if not prompts:
+            return []
+
+        workers = min(BATCH_QUERY_WORKERS, len(prompts))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(
+                lambda prompt: self.query(prompt, include_context, temperature),
+                prompts
+            ))
+
+    def reset_context(self):
+        """Start the next streamed turn without the previous conversation"""
+        self.last_context = None
+
+    def stream_query(
+        self,
+        prompt: str,
+        include_context: bool = True,
+        min_batch_size: int = 1,
+        max_batch_size: int = 32,
+        growth_factor: int = 3
+    ):
         """
         Stream response from Legacy AI (for real-time output).
         Yields chunks of response as they're generated.
+
+        Tokens are grouped so the caller writes once per batch rather than
+        once per token. The first batch is a single token (min_batch_size)
+        and each following batch is growth_factor times larger, capped at
+        max_batch_size. A pending batch is also yielded once it is
+        STREAM_FLUSH_INTERVAL seconds old.
+
+        Each turn continues from the Ollama context tokens of the previous
+        one, so the earlier conversation is not prefilled again.
         """
         full_prompt = prompt
 
@@ -154,33 +239,57 @@ class LegacyAI:
             operational_context = self.get_operational_context()
             full_prompt = f"{operational_context}\n\nQuery: {prompt}"
 
+        payload = {
+            "model": self.model_name,
+            "prompt": full_prompt,
+            "stream": True
+        }
+        if self.last_context:
+            payload["context"] = self.last_context
+
         try:
-            response = requests.post(
+            # The with block releases the pooled connection even when the
+            # caller stops iterating early
+            with _session.post(
                 f"{self.ollama_url}/api/generate",
-                json={
-                    "model": self.model_name,
-                    "prompt": full_prompt,
-                    "stream": True
-                },
+                json=payload,
                 stream=True,
                 timeout=120
-            )
-
-            full_response = ""
-
-            for line in response.iter_lines():
-                if line:
-                    chunk = json.loads(line)
-                    if "response" in chunk:
-                        text = chunk["response"]
-                        full_response += text
-                        yield text
+            ) as response:
+                if response.status_code != 200:
+                    logger.error(f"Ollama API error: {response.status_code}")
+                    yield f"\n[Error: Ollama API returned {response.status_code}]"
+                    return
+
+                # Every token received; parts[batch_start:] is the pending batch
+                parts = []
+                batch_start = 0
+                batch_size = min_batch_size
+                last_flush = time.monotonic()
+
+                for line in response.iter_lines(chunk_size=jsonio.STREAM_CHUNK_SIZE):
+                    if line:
+                        chunk = jsonio.loads(line)
+                        if chunk.get("done"):
+                            self.last_context = chunk.get("context")
+                        if "response" in chunk:
+                            parts.append(chunk["response"])
+
+                            now = time.monotonic()
+                            if len(parts) - batch_start >= batch_size or now - last_flush >= STREAM_FLUSH_INTERVAL:
+                                yield "".join(parts[batch_start:])
+                                batch_start = len(parts)
+                                last_flush = now
+                                batch_size = min(batch_size * growth_factor, max_batch_size)
+
+                if batch_start < len(parts):
+                    yield "".join(parts[batch_start:])
 
             # Save to history
             self.conversation_history.append({
                 "timestamp": datetime.utcnow().isoformat(),
                 "prompt": prompt,
-                "response": full_response,
+                "response": "".join(parts),
                 "model": self.model_name
             })
 
@@ -192,13 +301,13 @@ class LegacyAI:
         """Save conversation history to disk"""
         conversation_file = self.memory_path / f"session_{self.session_id}.json"
 
-        with open(conversation_file, 'w') as f:
-            json.dump({
-                "session_id": self.session_id,
-                "model": self.model_name,
-                "created_at": datetime.utcnow().isoformat(),
-                "conversation": self.conversation_history
-            }, f, indent=2)
+        # Compact JSON; the history is only read back by load_conversation
+        conversation_file.write_bytes(jsonio.dumps({
+            "session_id": self.session_id,
+            "model": self.model_name,
+            "created_at": datetime.utcnow().isoformat(),
+            "conversation": self.conversation_history
+        }))
 
         logger.info(f"Conversation saved: {conversation_file}")
         return str(conversation_file)
@@ -208,10 +317,10 @@ class LegacyAI:
         conversation_file = self.memory_path / f"session_{session_id}.json"
 
         if conversation_file.exists():
-            with open(conversation_file) as f:
-                data = json.load(f)
-                self.conversation_history = data.get("conversation", [])
-                logger.info(f"Loaded {len(self.conversation_history)} messages")
+            data = jsonio.loads(conversation_file.read_bytes())
+            self.conversation_history = data.get("conversation", [])
+            self.reset_context()
+            logger.info(f"Loaded {len(self.conversation_history)} messages")
         else:
             logger.warning(f"Conversation not found: {session_id}")
 
@@ -245,18 +354,49 @@ Please recommend which driver to assign and explain why."""
         prompt = "Analyze the current driver performance and provide optimization recommendations."
         return self.query(prompt, include_context=True)
 
+    # Interactive commands; each returns True to leave interactive mode
+
+    def _cmd_exit(self):
+        self.save_conversation()
+        print("Conversation saved. Goodbye!")
+        return True
+
+    def _cmd_save(self):
+        file_path = self.save_conversation()
+        print(f"Saved: {file_path}")
+
+    def _cmd_context(self):
+        print("\n" + self.get_operational_context())
+
+    def _cmd_drivers(self):
+        drivers = self.get_active_drivers()
+        print(f"\nActive Drivers: {len(drivers)}")
+        for d in drivers:
+            print(f"  • {d['name']} - ${d['haul_rate']:.2f}")
+
+    def _cmd_reset(self):
+        self.reset_context()
+        print("Conversation context cleared.")
+
     def interactive_mode(self):
         """Interactive CLI for Legacy AI"""
+        # Command -> (handler, help text)
+        commands = {
+            'exit': (self._cmd_exit, "Quit"),
+            'save': (self._cmd_save, "Save conversation"),
+            'context': (self._cmd_context, "Show operational context"),
+            'drivers': (self._cmd_drivers, "List active drivers"),
+            'reset': (self._cmd_reset, "Start a fresh conversation"),
+        }
+
         print("\n" + "=" * 60)
         print("LEGACY AI - Interactive Mode")
         print("=" * 60)
         print(f"Model: {self.model_name}")
         print(f"Session: {self.session_id}")
         print("\nCommands:")
-        print("  'exit' - Quit")
-        print("  'save' - Save conversation")
-        print("  'context' - Show operational context")
-        print("  'drivers' - List active drivers")
+        for name, (_, help_text) in commands.items():
+            print(f"  '{name}' - {help_text}")
         print("=" * 60 + "\n")
 
         while True:
@@ -266,25 +406,10 @@ Please recommend which driver to assign and explain why."""
                 if not user_input:
                     continue
 
-                if user_input.lower() == 'exit':
-                    self.save_conversation()
-                    print("Conversation saved. Goodbye!")
-                    break
-
-                elif user_input.lower() == 'save':
-                    file_path = self.save_conversation()
-                    print(f"Saved: {file_path}")
-                    continue
-
-                elif user_input.lower() == 'context':
-                    print("\n" + self.get_operational_context())
-                    continue
-
-                elif user_input.lower() == 'drivers':
-                    drivers = self.get_active_drivers()
-                    print(f"\nActive Drivers: {len(drivers)}")
-                    for d in drivers:
-                        print(f"  • {d['name']} - ${d['haul_rate']:.2f}")
+                command = commands.get(user_input.lower())
+                if command:
+                    if command[0]():
+                        break
                     continue
 
                 # Stream AI response
@@ -21,6 +21,23 @@ USER_ID = os.getenv('USER_ID', 'shane_brazelton')
 # Life Command Center Sheet ID (update with actual sheet)
 LIFE_SHEET_ID = os.getenv('LIFE_SHEET_ID', '')
 
+# Copy the whole sheet row into each doc as raw_data (debugging aid only;
+# it duplicates every cell). Same switch as google_sheets_sync.
+STORE_RAW_DEBUG = os.getenv('STORE_RAW_DEBUG', 'false').lower() == 'true'
+
+# Sheet tab -> range synced from it
+LIFE_RANGES = {
+    "Finance": "Finance!A2:Z",
+    "Family": "Family!A2:Z",
+    "Goals": "Goals!A2:Z",
+}
+
+# Fills the Finance columns a short row is missing (Category, Amount, Date, Notes)
+_FINANCE_BLANK = ['', '', '', '']
+
+# Firestore caps a WriteBatch at 500 operations
+BATCH_SIZE = 500
+
 # Firestore private paths
 FINANCE_COLLECTION = f"artifacts/{APP_ID}/users/{USER_ID}/finance"
 FAMILY_COLLECTION = f"artifacts/{APP_ID}/users/{USER_ID}/family"
@@ -43,77 +60,120 @@ def get_sheets_service():
     return build('sheets', 'v4', credentials=creds)
 
 
-def sync_finance(sheets_service, db):
+def fetch_all_ranges(sheets_service):
+    """
+    Fetch every Life Command Center tab in one batchGet request.
+    Returns {tab: rows} for each tab in LIFE_RANGES.
+    """
+    result = sheets_service.spreadsheets().values().batchGet(
+        spreadsheetId=LIFE_SHEET_ID,
+        ranges=list(LIFE_RANGES.values())
+    ).execute()
+
+    # valueRanges come back in request order
+    value_ranges = result.get('valueRanges', [])
+    return {
+        tab: value_range.get('values', [])
+        for tab, value_range in zip(LIFE_RANGES, value_ranges)
+    }
+
+
+def sync_finance(sheets_service, db, rows=None):
     """
     Sync personal finance data from Life Command Center sheet.
     Expected: Income, Expenses, Budgets, Savings Goals
+    Uses rows from fetch_all_ranges when given, otherwise reads the tab.
     """
     if not LIFE_SHEET_ID:
         print("LIFE_SHEET_ID not set. Skipping finance sync.")
         return
 
-    range_name = "Finance!A2:Z"
-
     try:
-        result = sheets_service.spreadsheets().values().get(
-            spreadsheetId=LIFE_SHEET_ID,
-            range=range_name
-        ).execute()
-
-        rows = result.get('values', [])
+        if rows is None:
+            result = sheets_service.spreadsheets().values().get(
+                spreadsheetId=LIFE_SHEET_ID,
+                range=LIFE_RANGES["Finance"]
+            ).execute()
+            rows = result.get('values', [])
 
         if not rows:
             print("No finance data found.")
             return
 
+        # One timestamp and collection reference for every row in this sync
+        now_iso = datetime.utcnow().isoformat()
+        collection = db.collection(FINANCE_COLLECTION)
         synced_count = 0
+        error_count = 0
+        batch = db.batch()
         for idx, row in enumerate(rows):
             if len(row) < 2:
                 continue
 
             # Example structure: Category, Amount, Date, Notes
+            category, amount, date, notes = row[:4] + _FINANCE_BLANK[len(row):]
+
+            # A bad amount skips its own row; raising here would drop every
+            # row already queued in the uncommitted batch
+            try:
+                amount = float(amount) if amount else 0.0
+            except ValueError:
+                print(f"Skipping finance row {idx + 2}: invalid amount {amount!r}")
+                error_count += 1
+                continue
+
             finance_data = {
-                'category': row[0] if len(row) > 0 else '',
-                'amount': float(row[1]) if len(row) > 1 and row[1] else 0.0,
-                'date': row[2] if len(row) > 2 else '',
-                'notes': row[3] if len(row) > 3 else '',
-                'last_updated': datetime.utcnow().isoformat(),
-                'raw_data': row
+                'category': category,
+                'amount': amount,
+                'date': date,
+                'notes': notes,
+                'last_updated': now_iso
             }
+            if STORE_RAW_DEBUG:
+                finance_data['raw_data'] = row
 
             doc_id = f"entry_{idx}"
-            db.collection(FINANCE_COLLECTION).document(doc_id).set(finance_data)
+            batch.set(collection.document(doc_id), finance_data)
             synced_count += 1
+            if synced_count % BATCH_SIZE == 0:
+                batch.commit()
+                batch = db.batch()
 
-        print(f"Synced {synced_count} finance entries to Firestore.")
+        if synced_count % BATCH_SIZE:
+            batch.commit()
+
+        print(f"Synced {synced_count} finance entries to Firestore ({error_count} errors).")
 
     except Exception as e:
         print(f"Finance sync error: {e}")
 
 
-def sync_family(sheets_service, db):
+def sync_family(sheets_service, db, rows=None):
     """
     Sync family-related data (schedules, events, contacts).
+    Uses rows from fetch_all_ranges when given, otherwise reads the tab.
     """
     if not LIFE_SHEET_ID:
         print("LIFE_SHEET_ID not set. Skipping family sync.")
         return
 
-    range_name = "Family!A2:Z"
-
     try:
-        result = sheets_service.spreadsheets().values().get(
-            spreadsheetId=LIFE_SHEET_ID,
-            range=range_name
-        ).execute()
-
-        rows = result.get('values', [])
+        if rows is None:
+            result = sheets_service.spreadsheets().values().get(
+                spreadsheetId=LIFE_SHEET_ID,
+                range=LIFE_RANGES["Family"]
+            ).execute()
+            rows = result.get('values', [])
 
         if not rows:
             print("No family data found.")
             return
 
+        # One timestamp and collection reference for every row in this sync
+        now_iso = datetime.utcnow().isoformat()
+        collection = db.collection(FAMILY_COLLECTION)
         synced_count = 0
+        batch = db.batch()
         for idx, row in enumerate(rows):
             if len(row) < 1:
                 continue
@@ -123,13 +183,20 @@ def sync_family(sheets_service, db):
                 'date': row[1] if len(row) > 1 else '',
                 'participants': row[2] if len(row) > 2 else '',
                 'notes': row[3] if len(row) > 3 else '',
-                'last_updated': datetime.utcnow().isoformat(),
-                'raw_data': row
+                'last_updated': now_iso
             }
+            if STORE_RAW_DEBUG:
+                family_data['raw_data'] = row
 
             doc_id = f"event_{idx}"
-            db.collection(FAMILY_COLLECTION).document(doc_id).set(family_data)
+            batch.set(collection.document(doc_id), family_data)
             synced_count += 1
+            if synced_count % BATCH_SIZE == 0:
+                batch.commit()
+                batch = db.batch()
+
+        if synced_count % BATCH_SIZE:
+            batch.commit()
 
         print(f"Synced {synced_count} family events to Firestore.")
 
@@ -137,29 +204,32 @@ def sync_family(sheets_service, db):
         print(f"Family sync error: {e}")
 
 
-def sync_goals(sheets_service, db):
+def sync_goals(sheets_service, db, rows=None):
     """
     Sync personal and professional goals.
+    Uses rows from fetch_all_ranges when given, otherwise reads the tab.
     """
     if not LIFE_SHEET_ID:
         print("LIFE_SHEET_ID not set. Skipping goals sync.")
         return
 
-    range_name = "Goals!A2:Z"
-
     try:
-        result = sheets_service.spreadsheets().values().get(
-            spreadsheetId=LIFE_SHEET_ID,
-            range=range_name
-        ).execute()
-
-        rows = result.get('values', [])
+        if rows is None:
+            result = sheets_service.spreadsheets().values().get(
+                spreadsheetId=LIFE_SHEET_ID,
+                range=LIFE_RANGES["Goals"]
+            ).execute()
+            rows = result.get('values', [])
 
         if not rows:
             print("No goals data found.")
             return
 
+        # One timestamp and collection reference for every row in this sync
+        now_iso = datetime.utcnow().isoformat()
+        collection = db.collection(GOALS_COLLECTION)
         synced_count = 0
+        batch = db.batch()
         for idx, row in enumerate(rows):
             if len(row) < 1:
                 continue
@@ -169,13 +239,20 @@ def sync_goals(sheets_service, db):
                 'target_date': row[1] if len(row) > 1 else '',
                 'status': row[2] if len(row) > 2 else 'pending',
                 'progress': row[3] if len(row) > 3 else '',
-                'last_updated': datetime.utcnow().isoformat(),
-                'raw_data': row
+                'last_updated': now_iso
             }
+            if STORE_RAW_DEBUG:
+                goals_data['raw_data'] = row
 
             doc_id = f"goal_{idx}"
-            db.collection(GOALS_COLLECTION).document(doc_id).set(goals_data)
+            batch.set(collection.document(doc_id), goals_data)
             synced_count += 1
+            if synced_count % BATCH_SIZE == 0:
+                batch.commit()
+                batch = db.batch()
+
+        if synced_count % BATCH_SIZE:
+            batch.commit()
 
         print(f"Synced {synced_count} goals to Firestore.")
 
@@ -190,9 +267,18 @@ def main():
     db = init_firebase()
     sheets_service = get_sheets_service()
 
-    sync_finance(sheets_service, db)
-    sync_family(sheets_service, db)
-    sync_goals(sheets_service, db)
+    # One request for all tabs; if it fails (e.g. a tab is missing) each
+    # sync reads its own tab so the others still go through
+    sheet_data = {}
+    if LIFE_SHEET_ID:
+        try:
+            sheet_data = fetch_all_ranges(sheets_service)
+        except Exception as e:
+            print(f"Batch fetch failed, reading tabs individually: {e}")
+
+    sync_finance(sheets_service, db, rows=sheet_data.get("Finance"))
+    sync_family(sheets_service, db, rows=sheet_data.get("Family"))
+    sync_goals(sheets_service, db, rows=sheet_data.get("Goals"))
 
     print("Life Command Center sync complete.")
 
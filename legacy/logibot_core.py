@@ -7,26 +7,42 @@ Main execution loop with Ollama AI integration for SRM Dispatch automation.
 import sys
 import time
 import signal
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from config import config
 from logger import LogiLogger, log_execution
-from google_sheets_sync import sync_drivers, sync_plants, init_firebase, get_sheets_service
+import jsonio
+from google_sheets_sync import init_firebase, get_sheets_service, run_full_sync
 
 # Initialize logger
 logger = LogiLogger.get_logger("logibot_core")
 
-# Global flag for graceful shutdown
-shutdown_requested = False
+# Pooled keep-alive connections to Ollama, shared by every OllamaClient
+_session = requests.Session()
+_session.mount('http://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+))
+
+# How long a successful Ollama probe is trusted by the sync loop
+OLLAMA_CHECK_TTL = 60
+
+# Set on SIGINT/SIGTERM; waits between sync cycles return as soon as it is set
+shutdown_event = threading.Event()
 
 
 def signal_handler(sig, frame):
     """Handle shutdown signals gracefully"""
-    global shutdown_requested
     logger.info(f"Received signal {sig}. Initiating graceful shutdown...")
-    shutdown_requested = True
+    shutdown_event.set()
 
 
 # Register signal handlers
@@ -40,44 +56,75 @@ class OllamaClient:
     def __init__(self, base_url: str = None, model: str = None):
         self.base_url = base_url or config.OLLAMA_BASE_URL
         self.model = model or config.OLLAMA_MODEL
+        self._available_at = None  # monotonic time of the last successful probe
+        self.last_context = None  # Ollama context tokens from the last generation
         logger.info(f"Initialized Ollama client: {self.base_url} - Model: {self.model}")
 
-    def is_available(self) -> bool:
-        """Check if Ollama service is available"""
+    def is_available(self, max_age: float = 0) -> bool:
+        """
+        Check if Ollama service is available
+
+        Args:
+            max_age: Trust a successful probe made within this many seconds
+                     instead of probing again (0 always probes)
+        """
+        if max_age and self._available_at is not None \
+                and time.monotonic() - self._available_at < max_age:
+            return True
+
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            return response.status_code == 200
+            response = _session.get(f"{self.base_url}/api/tags", timeout=5)
+            available = response.status_code == 200
         except requests.RequestException as e:
             logger.warning(f"Ollama service not available: {e}")
-            return False
+            available = False
+
+        self._available_at = time.monotonic() if available else None
+        return available
+
+    def reset_context(self):
+        """Start the next generation without the previous conversation"""
+        self.last_context = None
 
-    def generate(self, prompt: str, context: Optional[str] = None) -> Optional[str]:
-        """Generate response using Ollama"""
+    def generate(self, prompt: str, context: Optional[List[int]] = None) -> Optional[str]:
+        """
+        Generate response using Ollama
+
+        Continues from the context tokens of the previous generation (or the
+        given context) so Ollama reuses its cached prefix instead of
+        re-reading the whole conversation; see reset_context().
+        """
+        context = context or self.last_context
         try:
             payload = {
                 "model": self.model,
                 "prompt": prompt,
-                "stream": False
+                "stream": True
             }
 
             if context:
                 payload["context"] = context
 
-            response = requests.post(
+            # Streamed and merged here; Ollama's buffered (stream: false)
+            # path can stall long generations
+            with _session.post(
                 f"{self.base_url}/api/generate",
                 json=payload,
+                stream=True,
                 timeout=60
-            )
+            ) as response:
+                if response.status_code != 200:
+                    logger.error(f"Ollama API error: {response.status_code}")
+                    return None
+                result = jsonio.read_generate_stream(response)
 
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("response", "")
-            else:
-                logger.error(f"Ollama API error: {response.status_code}")
-                return None
+            self.last_context = result.get("context")
+            return result.get("response", "")
 
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             logger.error(f"Failed to generate response: {e}")
+            # Probe again before the next cycle trusts the service
+            self._available_at = None
             return None
 
     def analyze_driver_data(self, driver_stats: Dict[str, Any]) -> Optional[str]:
@@ -108,17 +155,29 @@ class LogiBotOrchestrator:
         """Initialize all required services"""
         logger.info("Initializing LogiBot services...")
 
-        # Firebase
-        self.db = init_firebase()
-        logger.info("✓ Firebase initialized")
+        def connect_ollama():
+            client = OllamaClient()
+            return client, client.is_available()
+
+        # The three start-ups are independent network round trips, so run
+        # them together; results are read in a fixed order for the log
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            firebase_future = executor.submit(init_firebase)
+            sheets_future = executor.submit(get_sheets_service)
+            ollama_future = executor.submit(connect_ollama)
+
+            # Firebase
+            self.db = firebase_future.result()
+            logger.info("✓ Firebase initialized")
 
-        # Google Sheets API
-        self.sheets_service = get_sheets_service()
-        logger.info("✓ Google Sheets API initialized")
+            # Google Sheets API
+            self.sheets_service = sheets_future.result()
+            logger.info("✓ Google Sheets API initialized")
 
-        # Ollama (optional - system works without it)
-        self.ollama_client = OllamaClient()
-        if self.ollama_client.is_available():
+            # Ollama (optional - system works without it)
+            self.ollama_client, ollama_available = ollama_future.result()
+
+        if ollama_available:
             logger.info("✓ Ollama AI available")
         else:
             logger.warning("⚠ Ollama AI not available - continuing without AI features")
@@ -137,16 +196,16 @@ class LogiBotOrchestrator:
         }
 
         try:
-            # Sync drivers
-            driver_stats = sync_drivers(self.sheets_service, self.db)
+            # Sync drivers and plants (one sheet fetch; the run is recorded
+            # in sync_status for the health monitor)
+            driver_stats, plant_stats = run_full_sync(self.sheets_service, self.db)
             results['drivers'] = driver_stats
-
-            # Sync plants
-            plant_stats = sync_plants(self.sheets_service, self.db)
             results['plants'] = plant_stats
 
-            # AI analysis (if available)
-            if self.ollama_client and self.ollama_client.is_available():
+            # AI analysis (if available); each cycle is analysed on its own so
+            # the context doesn't grow for the lifetime of the daemon
+            if self.ollama_client and self.ollama_client.is_available(max_age=OLLAMA_CHECK_TTL):
+                self.ollama_client.reset_context()
                 analysis = self.ollama_client.analyze_driver_data(driver_stats)
                 if analysis:
                     logger.info(f"AI Analysis: {analysis}")
@@ -165,12 +224,10 @@ class LogiBotOrchestrator:
     @log_execution
     def run_continuous(self):
         """Run continuous sync loop"""
-        global shutdown_requested
-
         logger.info("Starting continuous sync mode")
         logger.info(f"Sync interval: {config.SYNC_INTERVAL_MINUTES} minutes")
 
-        while not shutdown_requested:
+        while not shutdown_event.is_set():
             try:
                 # Run sync cycle
                 results = self.run_sync_cycle()
@@ -183,14 +240,11 @@ class LogiBotOrchestrator:
 
                 # Wait for next cycle
                 logger.info(f"Next sync in {config.SYNC_INTERVAL_MINUTES} minutes")
-                for _ in range(config.SYNC_INTERVAL_MINUTES * 60):
-                    if shutdown_requested:
-                        break
-                    time.sleep(1)
+                shutdown_event.wait(config.SYNC_INTERVAL_MINUTES * 60)
 
             except Exception as e:
                 logger.error(f"Error in continuous loop: {e}", exc_info=True)
-                time.sleep(60)  # Wait 1 minute before retrying
+                shutdown_event.wait(60)  # Wait 1 minute before retrying
 
         logger.info("Continuous sync mode stopped")
 
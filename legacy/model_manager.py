@@ -4,17 +4,45 @@ Model Version Manager for Legacy AI
 Handles model versioning, deployment, and lifecycle management on 8TB drive.
 """
 
-import json
+import time
 import shutil
 import subprocess
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Any, Optional
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Set
 
+from config import config
 from logger import LogiLogger
+import jsonio
 
 logger = LogiLogger.get_logger("model_manager")
 
+# Seconds the list of installed Ollama models is reused before asking again
+OLLAMA_TAGS_TTL = 30
+
+# Upper bound on metadata files read at once by get_model_stats
+METADATA_READ_WORKERS = 32
+
+# Upper bound on concurrent Ollama deletions during cleanup_old_models
+DELETE_WORKERS = 8
+
+# Seconds export_model waits for `ollama show`
+OLLAMA_SHOW_TIMEOUT = 60
+
+# Keep-alive connection to the Ollama daemon
+_session = requests.Session()
+
+
+def _registered_at(model: Dict[str, Any]) -> datetime:
+    """A registry entry's registered_at as aware UTC (older entries are naive UTC)"""
+    registered = datetime.fromisoformat(model["registered_at"])
+    if registered.tzinfo is None:
+        registered = registered.replace(tzinfo=timezone.utc)
+    return registered
+
 
 class ModelManager:
     """Manage trained model versions and deployments"""
@@ -24,20 +52,76 @@ class ModelManager:
         self.model_dir.mkdir(parents=True, exist_ok=True)
         self.registry_file = self.model_dir / "model_registry.json"
         self.registry = self.load_registry()
+        self._dirty = False      # registry changed since it was last written
+        self._batch_depth = 0    # > 0 while inside batch(); saves are deferred
+        self._tags_cache = (None, set())  # (monotonic time, installed model names)
 
         logger.info(f"Model Manager initialized: {model_dir}")
 
     def load_registry(self) -> Dict[str, Any]:
-        """Load model registry"""
+        """
+        Load model registry.
+        Models are kept in memory as a dict keyed by name; the file stores
+        them as a list (see save_registry).
+        """
+        registry = {"models": [], "active_model": None}
         if self.registry_file.exists():
-            with open(self.registry_file) as f:
-                return json.load(f)
-        return {"models": [], "active_model": None}
+            registry = jsonio.loads(self.registry_file.read_bytes())
+
+        models = registry.get("models", [])
+        if isinstance(models, list):
+            registry["models"] = {m["name"]: m for m in models}
+        return registry
 
     def save_registry(self):
-        """Save model registry"""
-        with open(self.registry_file, 'w') as f:
-            json.dump(self.registry, f, indent=2)
+        """Save model registry (deferred to the end of batch() when inside one)"""
+        self._dirty = True
+        if self._batch_depth:
+            return
+
+        # Written atomically and fsynced so a crash never leaves a
+        # truncated or lost registry behind
+        on_disk = {**self.registry, "models": list(self.registry["models"].values())}
+        jsonio.write_atomic(self.registry_file, jsonio.dumps_pretty(on_disk))
+        self._dirty = False
+
+    @contextmanager
+    def batch(self):
+        """Defer registry saves until the block exits, then write once if changed"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._dirty:
+                self.save_registry()
+
+    def _ollama_models(self) -> Set[str]:
+        """
+        Names of the models installed in Ollama, from its /api/tags endpoint.
+        Models tagged ':latest' are also listed under their bare name.
+        Cached for OLLAMA_TAGS_TTL seconds.
+        """
+        cached_at, names = self._tags_cache
+        if cached_at is not None and time.monotonic() - cached_at < OLLAMA_TAGS_TTL:
+            return names
+
+        response = _session.get(f"{config.OLLAMA_BASE_URL}/api/tags", timeout=5)
+        response.raise_for_status()
+
+        names = set()
+        for model in jsonio.loads(response.content).get("models", []):
+            name = model["name"]
+            names.add(name)
+            if name.endswith(":latest"):
+                names.add(name[:-len(":latest")])
+
+        self._tags_cache = (time.monotonic(), names)
+        return names
+
+    def _invalidate_ollama_models(self):
+        """Ask Ollama again on the next _ollama_models() call"""
+        self._tags_cache = (None, set())
 
     def register_model(
         self,
@@ -48,22 +132,23 @@ class ModelManager:
         """Register a new model version"""
         model_entry = {
             "name": model_name,
-            "registered_at": datetime.utcnow().isoformat(),
+            "registered_at": datetime.now(timezone.utc).isoformat(),
             "metadata": metadata,
             "status": "active" if set_active else "available"
         }
 
-        self.registry["models"].append(model_entry)
+        self.registry["models"][model_name] = model_entry
 
         if set_active:
             self.registry["active_model"] = model_name
 
+        self._invalidate_ollama_models()
         self.save_registry()
         logger.info(f"Registered model: {model_name}")
 
     def list_models(self) -> List[Dict[str, Any]]:
         """List all registered models"""
-        return self.registry["models"]
+        return list(self.registry["models"].values())
 
     def get_active_model(self) -> Optional[str]:
         """Get currently active model name"""
@@ -73,13 +158,7 @@ class ModelManager:
         """Set active model for production use"""
         # Verify model exists in Ollama
         try:
-            result = subprocess.run(
-                ["ollama", "list"],
-                capture_output=True,
-                text=True
-            )
-
-            if model_name in result.stdout:
+            if model_name in self._ollama_models():
                 self.registry["active_model"] = model_name
                 self.save_registry()
                 logger.info(f"Active model set to: {model_name}")
@@ -92,42 +171,47 @@ class ModelManager:
             logger.error(f"Error setting active model: {e}")
             return False
 
-    def delete_model(self, model_name: str) -> bool:
-        """Delete model from Ollama and registry"""
+    def _ollama_delete(self, model_name: str) -> bool:
+        """Delete a model from Ollama through its /api/delete endpoint"""
         try:
-            # Remove from Ollama
-            result = subprocess.run(
-                ["ollama", "rm", model_name],
-                capture_output=True,
-                text=True
+            response = _session.delete(
+                f"{config.OLLAMA_BASE_URL}/api/delete",
+                json={"model": model_name},
+                timeout=30
             )
+            if response.status_code == 200:
+                return True
+            logger.error(f"Failed to delete model {model_name}: {response.text}")
+            return False
 
-            if result.returncode == 0:
-                # Remove from registry
-                self.registry["models"] = [
-                    m for m in self.registry["models"]
-                    if m["name"] != model_name
-                ]
+        except Exception as e:
+            logger.error(f"Error deleting model {model_name}: {e}")
+            return False
 
-                if self.registry.get("active_model") == model_name:
-                    self.registry["active_model"] = None
+    def _forget_model(self, model_name: str):
+        """Drop a model deleted from Ollama from the registry and save it"""
+        self.registry["models"].pop(model_name, None)
 
-                self.save_registry()
-                logger.info(f"Deleted model: {model_name}")
-                return True
-            else:
-                logger.error(f"Failed to delete model: {result.stderr}")
-                return False
+        if self.registry.get("active_model") == model_name:
+            self.registry["active_model"] = None
 
-        except Exception as e:
-            logger.error(f"Error deleting model: {e}")
+        self._invalidate_ollama_models()
+        self.save_registry()
+        logger.info(f"Deleted model: {model_name}")
+
+    def delete_model(self, model_name: str) -> bool:
+        """Delete model from Ollama and registry"""
+        if not self._ollama_delete(model_name):
             return False
 
+        self._forget_model(model_name)
+        return True
+
     def cleanup_old_models(self, keep_last_n: int = 5):
         """Remove old model versions, keeping only the N most recent"""
         models = sorted(
-            self.registry["models"],
-            key=lambda m: m["registered_at"],
+            self.registry["models"].values(),
+            key=_registered_at,
             reverse=True
         )
 
@@ -138,63 +222,98 @@ class ModelManager:
             if model["name"] != active_model:
                 models_to_delete.append(model["name"])
 
+        if not models_to_delete:
+            logger.info("Cleanup complete. Removed 0 old models")
+            return
+
         for model_name in models_to_delete:
             logger.info(f"Cleaning up old model: {model_name}")
-            self.delete_model(model_name)
 
-        logger.info(f"Cleanup complete. Removed {len(models_to_delete)} old models")
+        # Deletions run concurrently over the shared keep-alive session; the
+        # registry is updated here on the calling thread and written once
+        workers = min(DELETE_WORKERS, len(models_to_delete))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(self._ollama_delete, models_to_delete))
+
+        deleted = [name for name, ok in zip(models_to_delete, results) if ok]
+
+        # One registry write for the whole cleanup instead of one per model
+        with self.batch():
+            for model_name in deleted:
+                self._forget_model(model_name)
+
+        logger.info(f"Cleanup complete. Removed {len(deleted)} old models")
 
     def export_model(self, model_name: str, export_path: str) -> bool:
         """Export model for sharing or backup"""
         logger.info(f"Exporting model {model_name} to {export_path}")
 
+        export_dir = Path(export_path)
+        info_file = export_dir / f"{model_name}_info.txt"
+        exported = False
+
         try:
-            # Use ollama show to get model details
-            result = subprocess.run(
-                ["ollama", "show", model_name],
-                capture_output=True,
-                text=True
-            )
+            export_dir.mkdir(parents=True, exist_ok=True)
+
+            # Use ollama show to get model details, streamed straight into
+            # the info file; only stderr is kept for error reporting
+            with open(info_file, 'wb') as f:
+                result = subprocess.run(
+                    ["ollama", "show", model_name],
+                    stdout=f,
+                    stderr=subprocess.PIPE,
+                    timeout=OLLAMA_SHOW_TIMEOUT
+                )
 
             if result.returncode == 0:
-                export_dir = Path(export_path)
-                export_dir.mkdir(parents=True, exist_ok=True)
-
-                # Save model info
-                info_file = export_dir / f"{model_name}_info.txt"
-                with open(info_file, 'w') as f:
-                    f.write(result.stdout)
-
+                exported = True
                 logger.info(f"Model exported to: {export_path}")
-                return True
             else:
-                logger.error(f"Failed to export model: {result.stderr}")
-                return False
+                logger.error(f"Failed to export model: {result.stderr.decode(errors='replace')}")
 
         except Exception as e:
             logger.error(f"Error exporting model: {e}")
-            return False
+
+        if not exported:
+            info_file.unlink(missing_ok=True)
+        return exported
+
+    def load_metadata(self, model_name: str) -> Optional[Dict[str, Any]]:
+        """Load a model's training metadata (None if it has no metadata file)"""
+        metadata_file = self.model_dir / f"{model_name}_metadata.json"
+
+        if not metadata_file.exists():
+            return None
+        return jsonio.loads(metadata_file.read_bytes())
 
     def get_model_stats(self) -> Dict[str, Any]:
         """Get statistics about model usage and performance"""
+        models = self.list_models()
         stats = {
-            "total_models": len(self.registry["models"]),
+            "total_models": len(models),
             "active_model": self.get_active_model(),
             "models": []
         }
 
-        for model in self.registry["models"]:
-            metadata_file = self.model_dir / f"{model['name']}_metadata.json"
-
-            if metadata_file.exists():
-                with open(metadata_file) as f:
-                    metadata = json.load(f)
-                    stats["models"].append({
-                        "name": model["name"],
-                        "registered": model["registered_at"],
-                        "dataset": metadata.get("dataset_path", "unknown"),
-                        "metrics": metadata.get("metrics", {})
-                    })
+        if not models:
+            return stats
+
+        # Metadata files are small and latency-bound on the 8TB drive, so keep
+        # several reads in flight; map() returns them in registry order
+        workers = min(METADATA_READ_WORKERS, len(models))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            all_metadata = list(executor.map(
+                self.load_metadata, (model["name"] for model in models)
+            ))
+
+        for model, metadata in zip(models, all_metadata):
+            if metadata is not None:
+                stats["models"].append({
+                    "name": model["name"],
+                    "registered": model["registered_at"],
+                    "dataset": metadata.get("dataset_path", "unknown"),
+                    "metrics": metadata.get("metrics", {})
+                })
 
         return stats
 
@@ -211,10 +330,13 @@ class ModelManager:
         metadata_b_file = self.model_dir / f"{model_b}_metadata.json"
 
         if metadata_a_file.exists() and metadata_b_file.exists():
-            with open(metadata_a_file) as f:
-                meta_a = json.load(f)
-            with open(metadata_b_file) as f:
-                meta_b = json.load(f)
+            # Read both files at once so the two seeks overlap
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                a_bytes, b_bytes = executor.map(
+                    Path.read_bytes, (metadata_a_file, metadata_b_file)
+                )
+            meta_a = jsonio.loads(a_bytes)
+            meta_b = jsonio.loads(b_bytes)
 
             comparison["metadata_a"] = meta_a
             comparison["metadata_b"] = meta_b
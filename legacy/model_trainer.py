@@ -6,16 +6,109 @@ Supports LoRA/QLoRA for efficient training on consumer hardware.
 """
 
 import os
-import json
-import subprocess
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional
 
+from config import config
 from logger import LogiLogger
+import jsonio
 
 logger = LogiLogger.get_logger("model_trainer")
 
+# Keep-alive connection to the Ollama daemon
+_session = requests.Session()
+
+# Longest gap between progress events from /api/create or /api/pull before
+# the call is abandoned (a layer download or quantization step can be slow)
+OLLAMA_PROGRESS_TIMEOUT = 600
+
+# System prompt optimized for Shane's dispatch operations
+MODEL_SYSTEM_PROMPT = """You are Legacy AI, Shane Brazelton's personal dispatch optimization assistant for SRM Trucking.
+
+Your expertise:
+- Calculating haul rates: ($130/60) × RTM / 25 tons, rounded to $0.50, min $6.00
+- Driver assignment optimization based on cost and availability
+- Route planning with plant codes and locations
+- Real-time decision-making for dispatch operations
+
+Communication style:
+- Direct and concise (no filler, no apologies)
+- Focus on actionable recommendations
+- Prioritize cost efficiency and operational speed
+- Cite specific data (driver names, rates, RTM) in responses
+
+Data sources:
+- 19 active drivers with real-time availability
+- Plant codes and locations from SRM Operations
+- Historical performance patterns
+
+Always provide specific, data-driven recommendations.
+"""
+
+# Parameters optimized for dispatch decision-making
+MODEL_PARAMETERS = {
+    "temperature": 0.3,
+    "top_p": 0.9,
+    "top_k": 40,
+    "num_ctx": 4096,
+    "stop": ["Human:", "Assistant:"],
+}
+
+# Template for instruction-following
+MODEL_TEMPLATE = """{{ if .System }}<|system|>
+{{ .System }}<|end|>
+{{ end }}{{ if .Prompt }}<|user|>
+{{ .Prompt }}<|end|>
+{{ end }}<|assistant|>
+{{ .Response }}<|end|>
+"""
+
+_PARAMETER_LINES = "".join(
+    "".join(f'PARAMETER {key} "{item}"\n' for item in value)
+    if isinstance(value, list) else f"PARAMETER {key} {value}\n"
+    for key, value in MODEL_PARAMETERS.items()
+)
+
+# Everything in a Modelfile after its FROM line, encoded once at import;
+# create_modelfile only formats the header
+_MODELFILE_BODY = f"""
+# System prompt optimized for Shane's dispatch operations
+SYSTEM \"\"\"{MODEL_SYSTEM_PROMPT}\"\"\"
+
+# Parameters optimized for dispatch decision-making
+{_PARAMETER_LINES}
+# Template for instruction-following
+TEMPLATE \"\"\"{MODEL_TEMPLATE}\"\"\"
+""".encode()
+
+
+@lru_cache(maxsize=1)
+def _hardware_info() -> Dict[str, Any]:
+    """Hardware description, probed once per process (torch/CUDA init is slow)"""
+    import platform
+
+    info = {
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "python_version": platform.python_version(),
+    }
+
+    # Check for CUDA
+    try:
+        import torch
+        info["cuda_available"] = torch.cuda.is_available()
+        if info["cuda_available"]:
+            info["cuda_version"] = torch.version.cuda
+            info["gpu_name"] = torch.cuda.get_device_name(0)
+    except ImportError:
+        info["cuda_available"] = False
+
+    return info
+
 
 class ModelTrainer:
     """Fine-tune local Llama models with operational data"""
@@ -38,37 +131,56 @@ class ModelTrainer:
         logger.info(f"Dataset directory: {dataset_dir}")
 
     def check_ollama_availability(self) -> bool:
-        """Check if Ollama is available"""
+        """Check if Ollama is available (asks the daemon directly, no CLI process)"""
         try:
-            result = subprocess.run(
-                ["ollama", "list"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            return result.returncode == 0
+            response = _session.get(f"{config.OLLAMA_BASE_URL}/api/tags", timeout=10)
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"Ollama not available: {e}")
             return False
 
+    def _follow_progress(self, endpoint: str, payload: Dict[str, Any], action: str) -> bool:
+        """
+        POST to a streaming Ollama endpoint (/api/pull, /api/create) and log
+        each new status as it arrives. True once Ollama reports "success".
+        """
+        with _session.post(
+            f"{config.OLLAMA_BASE_URL}{endpoint}",
+            json=payload,
+            stream=True,
+            timeout=(10, OLLAMA_PROGRESS_TIMEOUT)
+        ) as response:
+            if response.status_code != 200:
+                logger.error(f"✗ {action} failed: HTTP {response.status_code} {response.text}")
+                return False
+
+            last_status = None
+            for line in response.iter_lines(chunk_size=jsonio.STREAM_CHUNK_SIZE):
+                if not line:
+                    continue
+                event = jsonio.loads(line)
+                if "error" in event:
+                    logger.error(f"✗ {action} failed: {event['error']}")
+                    return False
+
+                # Download progress repeats the same status many times; log changes only
+                status = event.get("status")
+                if status and status != last_status:
+                    logger.info(f"{action}: {status}")
+                    last_status = status
+
+        return last_status == "success"
+
     def pull_base_model(self) -> bool:
         """Pull base model if not already available"""
         logger.info(f"Checking for base model: {self.base_model}")
 
         try:
-            result = subprocess.run(
-                ["ollama", "pull", self.base_model],
-                capture_output=True,
-                text=True,
-                timeout=3600  # 1 hour timeout for large models
-            )
-
-            if result.returncode == 0:
+            if self._follow_progress("/api/pull", {"model": self.base_model}, "Pull"):
                 logger.info(f"Base model {self.base_model} ready")
                 return True
-            else:
-                logger.error(f"Failed to pull base model: {result.stderr}")
-                return False
+            logger.error(f"Failed to pull base model: {self.base_model}")
+            return False
 
         except Exception as e:
             logger.error(f"Error pulling base model: {e}")
@@ -79,91 +191,55 @@ class ModelTrainer:
         Create Ollama Modelfile for fine-tuning.
         Uses GGUF format optimized for CPU/GPU inference.
         """
-        modelfile_content = f"""# Legacy AI - {output_name}
+        header = f"""# Legacy AI - {output_name}
 # Fine-tuned on SRM Dispatch operational data
-# Generated: {datetime.utcnow().isoformat()}
+# Generated: {datetime.now(timezone.utc).isoformat()}
 
 FROM {self.base_model}
-
-# System prompt optimized for Shane's dispatch operations
-SYSTEM \"\"\"You are Legacy AI, Shane Brazelton's personal dispatch optimization assistant for SRM Trucking.
-
-Your expertise:
-- Calculating haul rates: ($130/60) × RTM / 25 tons, rounded to $0.50, min $6.00
-- Driver assignment optimization based on cost and availability
-- Route planning with plant codes and locations
-- Real-time decision-making for dispatch operations
-
-Communication style:
-- Direct and concise (no filler, no apologies)
-- Focus on actionable recommendations
-- Prioritize cost efficiency and operational speed
-- Cite specific data (driver names, rates, RTM) in responses
-
-Data sources:
-- 19 active drivers with real-time availability
-- Plant codes and locations from SRM Operations
-- Historical performance patterns
-
-Always provide specific, data-driven recommendations.
-\"\"\"
-
-# Parameters optimized for dispatch decision-making
-PARAMETER temperature 0.3
-PARAMETER top_p 0.9
-PARAMETER top_k 40
-PARAMETER num_ctx 4096
-PARAMETER stop "Human:"
-PARAMETER stop "Assistant:"
-
-# Template for instruction-following
-TEMPLATE \"\"\"{{ if .System }}<|system|>
-{{ .System }}<|end|>
-{{ end }}{{ if .Prompt }}<|user|>
-{{ .Prompt }}<|end|>
-{{ end }}<|assistant|>
-{{ .Response }}<|end|>
-\"\"\"
 """
 
         modelfile_path = self.model_dir / f"{output_name}_Modelfile"
-        with open(modelfile_path, 'w') as f:
-            f.write(modelfile_content)
+        fd = os.open(modelfile_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, header.encode() + _MODELFILE_BODY)
+        finally:
+            os.close(fd)
 
         logger.info(f"Created Modelfile: {modelfile_path}")
         return str(modelfile_path)
 
     def train_with_ollama(self, dataset_path: str, model_name: str) -> bool:
         """
-        Train model using Ollama's create command.
+        Train model using Ollama's create API.
         This creates a new model based on the Modelfile.
         """
         logger.info(f"Starting model training: {model_name}")
         logger.info(f"Dataset: {dataset_path}")
 
-        # Create Modelfile
-        modelfile_path = self.create_modelfile(dataset_path, model_name)
+        # The Modelfile is only kept next to the model as an on-disk record
+        # (it can be re-run with `ollama create -f`); the API call below
+        # sends the same settings from the module constants
+        self.create_modelfile(dataset_path, model_name)
 
-        # Create model with Ollama
+        # Create model through the Ollama API
         try:
-            result = subprocess.run(
-                ["ollama", "create", model_name, "-f", modelfile_path],
-                capture_output=True,
-                text=True,
-                timeout=7200,  # 2 hour timeout
-                cwd=str(self.model_dir)
-            )
-
-            if result.returncode == 0:
+            created = self._follow_progress("/api/create", {
+                "model": model_name,
+                "from": self.base_model,
+                "system": MODEL_SYSTEM_PROMPT,
+                "template": MODEL_TEMPLATE,
+                "parameters": MODEL_PARAMETERS
+            }, "Create")
+
+            if created:
                 logger.info(f"✓ Model created successfully: {model_name}")
-                logger.info(result.stdout)
                 return True
             else:
-                logger.error(f"✗ Model creation failed: {result.stderr}")
+                logger.error(f"✗ Model creation failed: {model_name}")
                 return False
 
-        except subprocess.TimeoutExpired:
-            logger.error("Model creation timed out after 2 hours")
+        except requests.Timeout:
+            logger.error(f"Model creation stalled: no progress for {OLLAMA_PROGRESS_TIMEOUT}s")
             return False
         except Exception as e:
             logger.error(f"Error during model creation: {e}")
@@ -265,24 +341,34 @@ print("Training complete: {self.model_dir}/{model_name}")
             "Is driver John Doe available?",
         ]
 
-        for query in test_queries:
-            logger.info(f"\nQuery: {query}")
-
-            try:
-                result = subprocess.run(
-                    ["ollama", "run", model_name, query],
-                    capture_output=True,
-                    text=True,
-                    timeout=60
-                )
-
-                if result.returncode == 0:
-                    logger.info(f"Response: {result.stdout[:200]}...")
-                else:
-                    logger.error(f"Query failed: {result.stderr}")
-
-            except Exception as e:
-                logger.error(f"Error testing query: {e}")
+        def run_query(query: str) -> str:
+            with _session.post(
+                f"{config.OLLAMA_BASE_URL}/api/generate",
+                json={
+                    "model": model_name,
+                    "prompt": query,
+                    "stream": True,
+                    "keep_alive": "10m"
+                },
+                stream=True,
+                timeout=60
+            ) as response:
+                if response.status_code != 200:
+                    raise RuntimeError(f"HTTP {response.status_code} {response.text}")
+                return jsonio.read_generate_stream(response)["response"]
+
+        # One loaded model serves every query; they are sent together and
+        # Ollama runs them in parallel (up to OLLAMA_NUM_PARALLEL) or queues them
+        with ThreadPoolExecutor(max_workers=len(test_queries)) as executor:
+            futures = [executor.submit(run_query, query) for query in test_queries]
+
+            for query, future in zip(test_queries, futures):
+                logger.info(f"\nQuery: {query}")
+
+                try:
+                    logger.info(f"Response: {future.result()[:200]}...")
+                except Exception as e:
+                    logger.error(f"Query failed: {e}")
 
         return True
 
@@ -292,38 +378,20 @@ print("Training complete: {self.model_dir}/{model_name}")
             "model_name": model_name,
             "base_model": self.base_model,
             "dataset_path": dataset_path,
-            "trained_at": datetime.utcnow().isoformat(),
+            "trained_at": datetime.now(timezone.utc).isoformat(),
             "metrics": metrics,
             "hardware": self.get_hardware_info()
         }
 
         metadata_file = self.model_dir / f"{model_name}_metadata.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        jsonio.write_atomic(metadata_file, jsonio.dumps_pretty(metadata))
 
         logger.info(f"Training metadata saved: {metadata_file}")
 
     def get_hardware_info(self) -> Dict[str, Any]:
         """Get hardware information"""
-        import platform
-
-        info = {
-            "platform": platform.platform(),
-            "processor": platform.processor(),
-            "python_version": platform.python_version(),
-        }
-
-        # Check for CUDA
-        try:
-            import torch
-            info["cuda_available"] = torch.cuda.is_available()
-            if torch.cuda.is_available():
-                info["cuda_version"] = torch.version.cuda
-                info["gpu_name"] = torch.cuda.get_device_name(0)
-        except ImportError:
-            info["cuda_available"] = False
-
-        return info
+        # Copy so callers can't modify the cached dict
+        return dict(_hardware_info())
 
     def train_legacy_ai(self, dataset_name: str = "legacy_ai_complete") -> bool:
         """
@@ -345,16 +413,27 @@ print("Training complete: {self.model_dir}/{model_name}")
             return False
 
         # Find latest dataset
-        dataset_files = list(self.dataset_dir.glob(f"{dataset_name}_train_*.jsonl"))
-        if not dataset_files:
+        # One scandir pass; DirEntry.stat() reuses the entry instead of re-statting
+        prefix = f"{dataset_name}_train_"
+        try:
+            with os.scandir(self.dataset_dir) as it:
+                latest = max(
+                    (e for e in it if e.name.startswith(prefix) and e.name.endswith(".jsonl")),
+                    key=lambda e: e.stat().st_mtime,
+                    default=None
+                )
+        except FileNotFoundError:
+            latest = None
+
+        if latest is None:
             logger.error(f"No training dataset found matching: {dataset_name}_train_*.jsonl")
             return False
 
-        latest_dataset = max(dataset_files, key=lambda p: p.stat().st_mtime)
+        latest_dataset = Path(latest.path)
         logger.info(f"Using dataset: {latest_dataset}")
 
         # Generate model name
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
         model_name = f"legacy-ai-srm-{timestamp}"
 
         # Train model
@@ -13,7 +13,7 @@ import threading
 
 from config import config
 from logger import LogiLogger
-from google_sheets_sync import sync_drivers, sync_plants, init_firebase, get_sheets_service
+from google_sheets_sync import init_firebase, get_sheets_service, run_full_sync
 
 # Initialize logger
 logger = LogiLogger.get_logger("webhook")
@@ -46,8 +46,7 @@ def trigger_sync_async():
     def run_sync():
         try:
             logger.info("Starting async sync from webhook")
-            driver_stats = sync_drivers(sheets_service, db)
-            plant_stats = sync_plants(sheets_service, db)
+            driver_stats, plant_stats = run_full_sync(sheets_service, db)
 
             total_synced = driver_stats['synced'] + plant_stats['synced']
             logger.info(f"Webhook-triggered sync complete - Synced: {total_synced}")
@@ -3,6 +3,7 @@
 Centralized logging utility for Angel Cloud / LogiBot
 """
 
+import functools
 import logging
 import sys
 from pathlib import Path
@@ -56,15 +57,19 @@ class LogiLogger:
 
 def log_execution(func):
     """Decorator for logging function execution"""
+    # Resolved once when the function is decorated, not on every call
+    logger = LogiLogger.get_logger()
+    name = func.__name__
+
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        logger = LogiLogger.get_logger()
-        logger.info(f"Executing {func.__name__}")
+        logger.info(f"Executing {name}")
         try:
             result = func(*args, **kwargs)
-            logger.info(f"Completed {func.__name__}")
+            logger.info(f"Completed {name}")
             return result
         except Exception as e:
-            logger.error(f"Error in {func.__name__}: {str(e)}", exc_info=True)
+            logger.error(f"Error in {name}: {str(e)}", exc_info=True)
             raise
     return wrapper
 
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Black Crab Park Blog Bot
+Run with: pytest test_blogger.py -v
+"""
+
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+from unittest.mock import Mock, patch
+
+BLOGGER_DIR = str(Path(__file__).resolve().parent / "bots" / "blogger")
+
+# Bot modules whose names are also used by modules at the repo root / legacy/
+_SHADOWED = ("config", "jsonio")
+
+
+def _import_blogger(*names):
+    """
+    Import bot modules against the bot's own config and jsonio. Modules of
+    the same name imported by other tests are set aside while the bot's
+    modules load, then restored.
+    """
+    saved = {name: sys.modules.pop(name) for name in _SHADOWED if name in sys.modules}
+    sys.path.insert(0, BLOGGER_DIR)
+    try:
+        return [importlib.import_module(name) for name in names]
+    finally:
+        sys.path.remove(BLOGGER_DIR)
+        for name in _SHADOWED:
+            sys.modules.pop(name, None)
+        sys.modules.update(saved)
+
+
+blogger_api, content_generator, scheduler = _import_blogger(
+    "blogger_api", "content_generator", "scheduler"
+)
+PostQueue = content_generator.PostQueue
+
+
+class TestPostQueue:
+    """Test the PostQueue operation log"""
+
+    def test_replay(self, tmp_path):
+        """Test that adds and mark_posted survive a reload"""
+        queue_file = tmp_path / "post_queue.jsonl"
+        queue = PostQueue(queue_file)
+        queue.add({"title": "First"})
+        queue.add({"title": "Second"})
+        queue.mark_posted(queue.get_next())
+
+        reloaded = PostQueue(queue_file)
+        assert [p["title"] for p in reloaded.queue] == ["First", "Second"]
+        assert reloaded.queue[0]["status"] == "posted"
+        assert reloaded.get_next()["title"] == "Second"
+        assert reloaded.get_pending_count() == 1
+
+    def test_compact(self, tmp_path):
+        """Test that compact() rewrites the log with one entry per pending post"""
+        queue_file = tmp_path / "post_queue.jsonl"
+        queue = PostQueue(queue_file)
+        queue.add({"title": "First"})
+        queue.add({"title": "Second"})
+        queue.mark_posted(queue.get_next())
+        assert len(queue_file.read_bytes().splitlines()) == 3
+
+        queue.compact()
+        assert len(queue_file.read_bytes().splitlines()) == 1
+        assert [p["title"] for p in queue.queue] == ["Second"]
+
+        reloaded = PostQueue(queue_file)
+        assert [p["title"] for p in reloaded.queue] == ["Second"]
+        assert reloaded.get_next()["title"] == "Second"
+
+    def test_log_is_compacted_as_posts_are_published(self, tmp_path):
+        """Test that publishing posts keeps the log bounded without calling compact()"""
+        queue_file = tmp_path / "post_queue.jsonl"
+        with patch.object(content_generator, "QUEUE_COMPACT_MIN_ENTRIES", 4):
+            queue = PostQueue(queue_file)
+            for n in range(3):
+                queue.add({"title": f"Post {n}"})
+                queue.mark_posted(queue.get_next())
+            queue.add({"title": "Pending"})
+
+        # The second publish reached the threshold and rewrote the log, dropping
+        # Post 0 and Post 1; Post 2's add/mark_posted and Pending came after
+        assert len(queue_file.read_bytes().splitlines()) == 3
+        reloaded = PostQueue(queue_file)
+        assert [p["title"] for p in reloaded.queue] == ["Post 2", "Pending"]
+        assert reloaded.get_next()["title"] == "Pending"
+
+    def test_corrupt_line_is_skipped(self, tmp_path):
+        """Test that entries after a torn line still replay and the log is repaired"""
+        queue_file = tmp_path / "post_queue.jsonl"
+        queue = PostQueue(queue_file)
+        queue.add({"title": "First"})
+        with open(queue_file, 'ab') as f:
+            f.write(b'{"op": "add", "post": {"tit\n')
+        queue._append({"op": "add", "post": {"title": "Second", "queued_at": "later", "status": "queued"}})
+
+        reloaded = PostQueue(queue_file)
+        assert [p["title"] for p in reloaded.queue] == ["First", "Second"]
+        assert reloaded.get_pending_count() == 2
+        assert b'"tit\n' not in queue_file.read_bytes()
+
+    def test_imports_legacy_json_queue(self, tmp_path):
+        """Test that a queue saved as a JSON list by older versions is imported"""
+        legacy_file = tmp_path / "post_queue.json"
+        legacy_file.write_text(
+            '[{"title": "Old", "queued_at": "2025-01-01T09:00:00", "status": "queued"}]'
+        )
+
+        queue = PostQueue(tmp_path / "post_queue.jsonl")
+        assert queue.get_next()["title"] == "Old"
+        assert not legacy_file.exists()
+        assert (tmp_path / "post_queue.json.migrated").exists()
+
+        reloaded = PostQueue(tmp_path / "post_queue.jsonl")
+        assert reloaded.get_next()["title"] == "Old"
+
+
+class TestSchedulerState:
+    """Test scheduler state persistence"""
+
+    def test_save_state_round_trip(self, tmp_path):
+        """Test that saved state is written atomically and read back by a new scheduler"""
+        paths = {"base_dir": tmp_path, "logs_dir": tmp_path / "logs"}
+        with patch.dict(scheduler.PATHS, paths):
+            first = scheduler.BlogScheduler(use_mock=True)
+            first._save_state({"last_post": "2025-01-01T09:00:00", "post_count": 3})
+
+            assert sorted(p.name for p in tmp_path.iterdir()) == ["logs", "scheduler_state.json"]
+
+            second = scheduler.BlogScheduler(use_mock=True)
+            assert second._load_state() == {"last_post": "2025-01-01T09:00:00", "post_count": 3}
+            assert second.should_post_today()
+
+
+class TestBloggerClient:
+    """Test the Blogger client's token handling"""
+
+    def test_create_post_refreshes_token_after_401(self, tmp_path):
+        """Test that a post rejected with 401 refreshes the token before retrying"""
+        from googleapiclient.errors import HttpError
+
+        client = blogger_api.BloggerClient()
+        client.credentials = Mock(refresh_token="refresh", valid=True)
+        client.credentials.to_json.return_value = '{"token": "new"}'
+        client.service = Mock()
+        client.service.posts().insert().execute.side_effect = HttpError(Mock(status=401), b"revoked")
+
+        new_service = Mock()
+        new_service.posts().insert().execute.return_value = {"id": "1", "title": "Hello"}
+
+        # Record refresh and the retried insert on one timeline
+        calls = Mock()
+        calls.attach_mock(client.credentials.refresh, "refresh")
+        calls.attach_mock(new_service.posts().insert().execute, "insert")
+
+        token_path = tmp_path / "blogger_token.json"
+        with patch.dict(blogger_api.GOOGLE_CONFIG, {"token_path": str(token_path)}), \
+                patch.object(blogger_api, "Request"), \
+                patch.object(blogger_api, "build", return_value=new_service), \
+                patch.object(blogger_api.BloggerClient, "_service_cache", {}), \
+                patch.object(blogger_api, "_creds_cache", {}), \
+                patch.object(client, "_log_post"):
+            post = client.create_post("Hello", "<p>Hi</p>")
+
+        assert post == {"id": "1", "title": "Hello"}
+        assert [c[0] for c in calls.mock_calls] == ["refresh", "insert"]
+        assert token_path.read_text() == '{"token": "new"}'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
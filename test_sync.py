@@ -137,21 +137,262 @@ class TestSyncFunctions:
         }
         mock_sheets.return_value = mock_service
 
-        # Mock Firestore
+        # Mock Firestore (BulkWriter reports each queued write as successful)
         mock_db = Mock()
         mock_collection = Mock()
         mock_doc = Mock()
         mock_db.collection.return_value = mock_collection
         mock_collection.document.return_value = mock_doc
+        mock_collection.select.return_value.stream.return_value = []
         mock_firebase.return_value = mock_db
 
+        mock_writer = mock_db.bulk_writer.return_value
+        mock_writer.set.side_effect = lambda ref, data: (
+            mock_writer.on_write_result.call_args[0][0](ref, Mock(), mock_writer)
+        )
+
         # Run sync
         stats = sync_drivers(mock_service, mock_db)
 
         # Verify results
         assert stats['synced'] == 3
         assert stats['errors'] == 0
-        assert mock_doc.set.call_count == 3
+        assert mock_writer.set.call_count == 3
+        mock_writer.flush.assert_called_once()
+
+    def test_sync_drivers_skips_unchanged(self):
+        """Test that rows matching the stored content hash are not rewritten"""
+        from google_sheets_sync import sync_drivers
+
+        rows = [
+            ['John Doe', '90', 'active'],
+            ['Jane Smith', '120', 'active']
+        ]
+
+        # First sync: nothing stored yet, both rows are written
+        mock_db = Mock()
+        mock_collection = mock_db.collection.return_value
+        mock_collection.select.return_value.stream.return_value = []
+        mock_writer = mock_db.bulk_writer.return_value
+
+        sync_drivers(Mock(), mock_db, rows=rows)
+        assert mock_writer.set.call_count == 2
+
+        # Second sync: John's stored hash matches, Jane's row changed
+        stored = []
+        for call in mock_writer.set.call_args_list:
+            data = call[0][1]
+            snapshot = Mock()
+            snapshot.id = data['name'].replace(' ', '_')
+            snapshot.to_dict.return_value = {'content_hash': data['content_hash']}
+            stored.append(snapshot)
+        mock_collection.select.return_value.stream.return_value = stored
+        mock_writer.set.reset_mock()
+
+        stats = sync_drivers(Mock(), mock_db, rows=[rows[0], ['Jane Smith', '150', 'active']])
+        assert stats['unchanged'] == 1
+        assert mock_writer.set.call_count == 1
+
+    def test_record_sync_status(self):
+        """Test that every run records last_sync_at, even when nothing changed"""
+        from google_sheets_sync import record_sync_status
+
+        mock_db = Mock()
+        stats = {'synced': 0, 'errors': 0, 'skipped': 0, 'unchanged': 2}
+        record_sync_status(mock_db, stats, stats)
+
+        mock_db.collection.assert_called_once_with(config.get_public_collection("sync_status"))
+        written = mock_db.collection.return_value.document.return_value.set.call_args[0][0]
+        assert datetime.fromisoformat(written['last_sync_at'])
+        assert written['drivers'] == stats
+
+
+class TestLifeCommandCenterSync:
+    """Test the Life Command Center finance sync"""
+
+    @patch('life_command_center_sync.LIFE_SHEET_ID', 'sheet-id')
+    def test_sync_finance_skips_bad_amount(self, capsys):
+        """Test that one bad amount skips its row without losing the rest of the batch"""
+        from life_command_center_sync import sync_finance
+
+        rows = [
+            ['Groceries', '120.50', '2025-01-02', ''],
+            ['Fuel', '80', '2025-01-03', ''],
+            ['Rent', 'n/a', '2025-01-04', ''],
+            ['Phone', '45', '2025-01-05', '']
+        ]
+
+        mock_db = Mock()
+        mock_db.collection.return_value.document.side_effect = lambda doc_id: doc_id
+        batch = mock_db.batch.return_value
+
+        sync_finance(Mock(), mock_db, rows=rows)
+
+        written = {call[0][0]: call[0][1]['amount'] for call in batch.set.call_args_list}
+        assert written == {'entry_0': 120.5, 'entry_1': 80.0, 'entry_3': 45.0}
+        batch.commit.assert_called_once()
+        assert "1 errors" in capsys.readouterr().out
+
+
+class TestOrchestrator:
+    """Test the LogiBot daemon's sync cycle"""
+
+    def test_sync_cycle_records_sync_status(self):
+        """Test that a daemon sync cycle records last_sync_at for the health monitor"""
+        from logibot_core import LogiBotOrchestrator
+
+        orchestrator = LogiBotOrchestrator()
+        orchestrator.sheets_service = Mock()
+        orchestrator.sheets_service.spreadsheets().values().batchGet().execute.return_value = {
+            'valueRanges': [{'values': [['John Doe', '90', 'active']]}, {'values': []}]
+        }
+        orchestrator.db = Mock()
+        orchestrator.db.collection.return_value.select.return_value.stream.return_value = []
+
+        results = orchestrator.run_sync_cycle()
+        assert results['success'] is True
+
+        orchestrator.db.collection.assert_any_call(config.get_public_collection("sync_status"))
+        status_doc = orchestrator.db.collection.return_value.document
+        status_doc.assert_any_call("sheets")
+        written = status_doc.return_value.set.call_args[0][0]
+        assert datetime.fromisoformat(written['last_sync_at'])
+        assert written['drivers'] is results['drivers']
+
+
+class TestHealthMonitor:
+    """Test health checks against mocked Firestore"""
+
+    def test_last_sync_time_uses_sync_status(self):
+        """Test that sync age comes from the sync_status document"""
+        from health_monitor import HealthMonitor
+
+        monitor = HealthMonitor()
+        monitor.db = Mock()
+        status_doc = monitor.db.collection.return_value.document.return_value.get.return_value
+        status_doc.exists = True
+        status_doc.to_dict.return_value = {'last_sync_at': datetime.utcnow().isoformat()}
+
+        result = monitor.check_last_sync_time()
+        assert result['status'] == 'healthy'
+        monitor.db.collection.assert_called_once_with(config.get_public_collection("sync_status"))
+
+    def test_last_sync_time_falls_back_to_drivers(self):
+        """Test the fallback to drivers' last_updated when no status is recorded"""
+        from health_monitor import HealthMonitor
+
+        monitor = HealthMonitor()
+        monitor.db = Mock()
+        collection = monitor.db.collection.return_value
+        collection.document.return_value.get.return_value.exists = False
+        driver = Mock()
+        driver.to_dict.return_value = {'last_updated': datetime.utcnow().isoformat()}
+        collection.order_by.return_value.limit.return_value.stream.return_value = [driver]
+
+        result = monitor.check_last_sync_time()
+        assert result['status'] == 'healthy'
+        assert result['last_sync'] == driver.to_dict.return_value['last_updated']
+
+
+class TestLegacyAIStreaming:
+    """Test LegacyAI.stream_query against a mocked Ollama stream"""
+
+    @patch('legacy_ai._session.post')
+    def test_stream_query_releases_response(self, mock_post):
+        """Test that stopping early or an HTTP error still closes the response"""
+        from legacy_ai import LegacyAI
+
+        ai = LegacyAI.__new__(LegacyAI)
+        ai.db = None
+        ai.ollama_url = "http://ollama"
+        ai.model_name = "legacy-ai"
+        ai.conversation_history = []
+        ai.last_context = None
+
+        mock_response = mock_post.return_value.__enter__.return_value
+        mock_response.status_code = 200
+        mock_response.iter_lines.return_value = [
+            b'{"response": "a"}',
+            b'{"response": "b", "done": true, "context": [1]}'
+        ]
+
+        stream = ai.stream_query("Test prompt", include_context=False)
+        assert next(stream) == "a"
+        stream.close()
+        mock_post.return_value.__exit__.assert_called_once()
+
+        # Error bodies are not parsed as stream events
+        mock_response.status_code = 500
+        chunks = list(ai.stream_query("Test prompt", include_context=False))
+        assert chunks == ["\n[Error: Ollama API returned 500]"]
+        mock_response.iter_lines.assert_called_once()
+
+
+class TestModelRegistry:
+    """Test the model registry file format and cleanup"""
+
+    def test_registry_round_trip(self, tmp_path):
+        """Test that models are a dict in memory and a list on disk"""
+        import jsonio
+        from model_manager import ModelManager
+
+        (tmp_path / "model_registry.json").write_bytes(jsonio.dumps({
+            "models": [{"name": "old", "registered_at": "2025-01-01T00:00:00", "status": "available"}],
+            "active_model": "old"
+        }))
+
+        manager = ModelManager(str(tmp_path))
+        assert list(manager.registry["models"]) == ["old"]
+
+        manager.register_model("new", {"dataset_path": "d.jsonl"})
+        on_disk = jsonio.loads((tmp_path / "model_registry.json").read_bytes())
+        assert [m["name"] for m in on_disk["models"]] == ["old", "new"]
+        assert on_disk["active_model"] == "old"
+
+        reloaded = ModelManager(str(tmp_path))
+        assert [m["name"] for m in reloaded.list_models()] == ["old", "new"]
+
+    @patch('model_manager._session.delete')
+    def test_cleanup_orders_mixed_timestamps(self, mock_delete, tmp_path):
+        """Test that cleanup keeps the newest models across naive and aware timestamps"""
+        import jsonio
+        from model_manager import ModelManager
+
+        mock_delete.return_value.status_code = 200
+        (tmp_path / "model_registry.json").write_bytes(jsonio.dumps({
+            "models": [
+                # Naive UTC (older format) and +00:00 entries, out of order
+                {"name": "a", "registered_at": "2025-01-03T10:00:00.500000"},
+                {"name": "b", "registered_at": "2025-01-03T10:00:00+00:00"},
+                {"name": "c", "registered_at": "2025-01-01T09:00:00"},
+                {"name": "d", "registered_at": "2025-01-02T09:00:00.000001+00:00"}
+            ],
+            "active_model": "c"
+        }))
+
+        manager = ModelManager(str(tmp_path))
+        with patch('jsonio.write_atomic', wraps=jsonio.write_atomic) as write_atomic:
+            manager.cleanup_old_models(keep_last_n=2)
+
+        # "d" is the only old model that isn't active; one registry write
+        mock_delete.assert_called_once()
+        assert write_atomic.call_count == 1
+        assert sorted(manager.registry["models"]) == ["a", "b", "c"]
+
+
+class TestJsonio:
+    """Test the legacy jsonio helpers"""
+
+    def test_write_atomic(self, tmp_path):
+        """Test that write_atomic replaces the file and leaves no temp file"""
+        import jsonio
+
+        path = tmp_path / "data.json"
+        path.write_bytes(b'{"old": true}')
+        jsonio.write_atomic(path, jsonio.dumps_pretty({"new": True}))
+
+        assert jsonio.loads(path.read_bytes()) == {"new": True}
+        assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
 
 
 @pytest.fixture
@@ -166,7 +407,7 @@ def mock_ollama_response():
 class TestOllamaIntegration:
     """Test Ollama AI integration"""
 
-    @patch('requests.get')
+    @patch('logibot_core._session.get')
     def test_ollama_availability_check(self, mock_get):
         """Test Ollama service availability check"""
         from logibot_core import OllamaClient
@@ -180,8 +421,8 @@ class TestOllamaIntegration:
         mock_get.return_value.status_code = 404
         assert client.is_available() is False
 
-    @patch('requests.post')
-    @patch('requests.get')
+    @patch('logibot_core._session.post')
+    @patch('logibot_core._session.get')
     def test_ollama_generate(self, mock_get, mock_post):
         """Test Ollama text generation"""
         from logibot_core import OllamaClient
@@ -189,15 +430,36 @@ class TestOllamaIntegration:
         # Mock availability check
         mock_get.return_value.status_code = 200
 
-        # Mock generation response
-        mock_post.return_value.status_code = 200
-        mock_post.return_value.json.return_value = {
-            "response": "Test response"
-        }
+        # Mock generation response (used as a context manager)
+        mock_response = mock_post.return_value.__enter__.return_value
+        mock_response.status_code = 200
+        mock_response.iter_lines.return_value = [
+            b'{"response": "Test "}',
+            b'{"response": "response", "done": true}'
+        ]
 
         client = OllamaClient()
         response = client.generate("Test prompt")
         assert response == "Test response"
+        mock_post.return_value.__exit__.assert_called_once()
+
+    @patch('logibot_core._session.post')
+    def test_ollama_generate_errors(self, mock_post):
+        """Test that failed or malformed generations return None and release the response"""
+        from logibot_core import OllamaClient
+
+        mock_response = mock_post.return_value.__enter__.return_value
+        client = OllamaClient()
+
+        # Non-200 reply
+        mock_response.status_code = 500
+        assert client.generate("Test prompt") is None
+        mock_post.return_value.__exit__.assert_called_once()
+
+        # Malformed NDJSON line
+        mock_response.status_code = 200
+        mock_response.iter_lines.return_value = [b'{"response": "Te']
+        assert client.generate("Test prompt") is None
 
 
 if __name__ == "__main__":